@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
@@ -11,6 +11,7 @@ from app.schemas.academic import (
     ClassroomCreate, ClassroomResponse
 )
 from app.services.academic_service import AcademicService
+from app.services.response_cache import response_cache
 
 router = APIRouter(prefix="/academic", tags=["Academic Management"])
 
@@ -23,8 +24,12 @@ def create_year(data: AcademicYearCreate, db: Session = Depends(get_db), current
     return AcademicService.create_academic_year(db, current_user.school_id, data)
 
 @router.get("/years", response_model=List[AcademicYearResponse])
-def get_years(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    return AcademicService.get_academic_years(db, current_user.school_id)
+def get_years(request: Request, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    return response_cache.respond(
+        request, "years", current_user.school_id,
+        lambda: AcademicService.get_academic_years(db, current_user.school_id),
+        List[AcademicYearResponse]
+    )
 
 # --- Terms ---
 
@@ -35,8 +40,12 @@ def create_term(data: TermCreate, db: Session = Depends(get_db), current_user =
     return AcademicService.create_term(db, data)
 
 @router.get("/terms", response_model=List[TermResponse])
-def get_terms(year_id: UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    return AcademicService.get_terms(db, year_id)
+def get_terms(request: Request, year_id: UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    return response_cache.respond(
+        request, "terms", current_user.school_id,
+        lambda: AcademicService.get_terms(db, year_id),
+        List[TermResponse]
+    )
 
 # --- Classrooms ---
 
@@ -47,5 +56,9 @@ def create_classroom(data: ClassroomCreate, db: Session = Depends(get_db), curre
     return AcademicService.create_classroom(db, current_user.school_id, data)
 
 @router.get("/classrooms", response_model=List[ClassroomResponse])
-def get_classrooms(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    return AcademicService.get_classrooms(db, current_user.school_id)
+def get_classrooms(request: Request, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    return response_cache.respond(
+        request, "classrooms", current_user.school_id,
+        lambda: AcademicService.get_classrooms(db, current_user.school_id),
+        List[ClassroomResponse]
+    )
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.v1.auth import get_current_user
+from app.config import get_settings
+from app.db.database import engine, async_engine, sync_pool_metrics, async_pool_metrics
+from app.db.replicas import replica_router
+from app.db.query_stats import route_query_stats
+
+settings = get_settings()
+
+router = APIRouter(prefix="/admin", tags=["Administration"])
+
+@router.get("/db-pool")
+def get_db_pool_stats(current_user = Depends(get_current_user)):
+    """
+    Connection pool metrics for this worker process: checkout latency
+    histogram, in-use/idle/overflow counts, timeouts and connection churn,
+    plus read replica health.
+    Super admin only.
+    """
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        },
+        "pools": [
+            sync_pool_metrics.snapshot(engine.pool),
+            async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+        ],
+        "replicas": replica_router.stats(),
+    }
+
+@router.get("/query-stats")
+def get_query_stats(current_user = Depends(get_current_user)):
+    """
+    Per-route SQL query counts and DB time over recent requests in this
+    worker process, busiest first. Routes flagged with n_plus_one_requests
+    repeat one statement N_PLUS_ONE_THRESHOLD+ times in a request.
+    Super admin only.
+    """
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return route_query_stats.table()
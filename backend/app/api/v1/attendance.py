@@ -1,15 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import date
 from uuid import UUID
 
 from app.db.database import get_db
+from app.db.replicas import get_async_read_db
+from app.db.rows import RowReader
 from app.api.v1.auth import get_current_user
 from app.schemas.performance import AttendanceResponse, AttendanceBulkCreate
 from app.services.attendance_service import AttendanceService
+from app.models.performance import Attendance
+from app.utils.msgpack_route import MsgPackRoute
 
-router = APIRouter(prefix="/attendance", tags=["Attendance Management"])
+# Bulk endpoints also take application/msgpack bodies
+router = APIRouter(prefix="/attendance", tags=["Attendance Management"], route_class=MsgPackRoute)
 
 @router.post("/bulk", response_model=List[AttendanceResponse])
 def bulk_mark_attendance(
@@ -19,6 +25,7 @@ def bulk_mark_attendance(
 ):
     """
     Bulk mark attendance for a classroom on a specific date.
+    Accepts JSON or application/msgpack bodies.
     """
     # Authorization: Only teachers or admins
     if current_user.role not in ["super_admin", "school_admin", "teacher"]:
@@ -27,13 +34,14 @@ def bulk_mark_attendance(
     return AttendanceService.bulk_mark_attendance(db, current_user.school_id, data)
 
 @router.get("/classroom/{classroom_id}", response_model=List[AttendanceResponse])
-def get_classroom_attendance(
+async def get_classroom_attendance(
     classroom_id: UUID,
     date: date,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user = Depends(get_current_user)
 ):
     """
     Retrieve attendance records for a specific classroom and date.
     """
-    return AttendanceService.get_classroom_attendance(db, classroom_id, date)
+    reader = RowReader(Attendance, AttendanceResponse)
+    return reader.response(await AttendanceService.get_classroom_attendance(db, reader, classroom_id, date))
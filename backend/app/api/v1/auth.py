@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
+from uuid import UUID
 
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
 from app.services.auth_service import AuthService
+from app.services.identity_cache import identity_cache
 from app.utils.security import decode_access_token
 
 # ==========================================
@@ -22,9 +25,9 @@ security = HTTPBearer()
 # Dependency: Get Current User
 # ==========================================
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     This function checks if someone is logged in.
@@ -32,40 +35,58 @@ def get_current_user(
     How it works:
     1. User sends their token (like showing an ID card)
     2. We decode the token (check if ID card is real)
-    3. We find the user in database
-    4. Return the user
+    3. We find the user (in the identity cache, or the database)
+    4. Return a read-only snapshot of the user
     
     If ANY step fails = "You're not logged in!"
     """
     # Get the token from the request
     token = credentials.credentials
     
-    # Decode the token to get user info
-    payload = decode_access_token(token)
-    
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Get user_id from token
-    user_id: str = payload.get("sub")
+    # Tokens we've already verified skip decoding
+    user_id = identity_cache.get_token(token)
     
     if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-        )
-    
-    # Find user in database
-    user = AuthService.get_user_by_id(db, user_id)
+        # Decode the token to get user info
+        payload = decode_access_token(token)
+        
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        # Get user_id from token
+        try:
+            user_id = UUID(payload.get("sub"))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+            )
+        
+        if payload.get("exp"):
+            identity_cache.put_token(token, user_id, payload["exp"])
+    
+    user = identity_cache.get_user(user_id)
     
     if user is None:
+        # Find user in database
+        db_user = await AuthService.get_user_by_id(db, user_id)
+        
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        
+        user = identity_cache.put_user(db_user)
+    
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail="User is inactive",
         )
     
     return user
@@ -75,7 +96,7 @@ def get_current_user(
 # ==========================================
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ):
@@ -91,7 +112,7 @@ def register_user(
     4. Save to database
     5. Return the new user (WITHOUT the password!)
     """
-    new_user = AuthService.create_user(db, user_data)
+    new_user = await AuthService.create_user(db, user_data)
     return new_user
 
 # ==========================================
@@ -99,7 +120,7 @@ def register_user(
 # ==========================================
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     credentials: UserLogin,
     db: Session = Depends(get_db)
 ):
@@ -117,7 +138,7 @@ def login(
     5. Return the token
     """
     # Try to authenticate
-    user = AuthService.authenticate_user(db, credentials)
+    user = await AuthService.authenticate_user(db, credentials)
     
     if not user:
         raise HTTPException(
@@ -147,4 +168,18 @@ def get_me(current_user = Depends(get_current_user)):
     
     This endpoint is PROTECTED - you must be logged in to use it.
     """
-    return current_user
\ No newline at end of file
+    return current_user
+
+# ==========================================
+# ENDPOINT 4: Identity Cache Stats
+# ==========================================
+
+@router.get("/cache-stats")
+def get_identity_cache_stats(current_user = Depends(get_current_user)):
+    """
+    Hit/miss counters for the identity cache in this worker process.
+    Super admin only.
+    """
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return identity_cache.stats()
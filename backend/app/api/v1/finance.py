@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, File, Form, Request, UploadFile, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from uuid import UUID
 
 from app.db.database import get_db
+from app.db.pagination import KeysetPage, PageParams, page_params, page_response
+from app.db.replicas import get_read_db, get_async_read_db
+from app.db.rows import RowReader
 from app.api.v1.auth import get_current_user
 from app.schemas.finance import (
     FeeStructureCreate, FeeStructureResponse,
     PaymentCreate, PaymentResponse,
-    FeeBalanceResponse
+    FeeBalanceResponse, ClassroomFeeBalanceResponse,
+    PaymentImportResult
 )
+from app.models.finance import Payment
 from app.services.finance_service import FinanceService
+from app.services.payment_import_service import PaymentImportService
+from app.services.response_cache import response_cache
 
 router = APIRouter(prefix="/finance", tags=["Fee Management & Payments"])
 
@@ -32,10 +40,17 @@ def create_fee_structure(
 
 @router.get("/structures", response_model=List[FeeStructureResponse])
 def get_fee_structures(
+    request: Request,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    return FinanceService.get_fee_structures(db, current_user.school_id)
+    # Cached, so read from the primary: a lagging replica would refill the
+    # cache with the pre-invalidation data for a whole TTL
+    return response_cache.respond(
+        request, "fee_structures", current_user.school_id,
+        lambda: FinanceService.get_fee_structures(db, current_user.school_id),
+        List[FeeStructureResponse]
+    )
 
 # --- Payments ---
 
@@ -53,24 +68,47 @@ def record_payment(
         raise HTTPException(status_code=403, detail="Forbidden")
     return FinanceService.record_payment(db, current_user.school_id, current_user.id, data)
 
+@router.post("/payments/import", response_model=PaymentImportResult)
+def import_payments(
+    term_id: UUID = Form(...),
+    payment_method: str = Form("Bank", description="Used when the file has no method column"),
+    file: UploadFile = File(..., description="CSV or XLSX with admission_number, amount, reference, date columns"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Import a bank or mobile-money statement.
+    Valid lines are recorded, invalid or duplicate ones are reported by line number.
+    Only bursars or admins.
+    """
+    if current_user.role not in ["super_admin", "school_admin", "bursar"]:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return PaymentImportService.import_payments(
+        db, current_user.school_id, current_user.id, term_id,
+        file.file, file.filename or "", payment_method
+    )
+
 @router.get("/payments/student/{student_id}", response_model=List[PaymentResponse])
 def get_student_payments(
+    request: Request,
     student_id: UUID,
-    db: Session = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """
-    Get payment history for a specific student.
+    Get payment history for a specific student, one page at a time (follow X-Next-Cursor).
     """
     # Authorization: User can see their own payments (if student) or staff can see all
     if current_user.role == "student" and current_user.id != student_id:
         raise HTTPException(status_code=403, detail="Cannot view other students' payments")
         
-    return FinanceService.get_student_payments(db, student_id)
+    page = KeysetPage(Payment, PaymentResponse, params)
+    return page_response(request, FinanceService.get_student_payments(db, student_id, page))
 
 @router.get("/payments/all", response_model=List[PaymentResponse])
 def get_all_payments(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """
@@ -78,11 +116,12 @@ def get_all_payments(
     """
     if current_user.role not in ["super_admin", "school_admin", "bursar"]:
         raise HTTPException(status_code=403, detail="Forbidden")
-    return FinanceService.get_all_payments(db, current_user.school_id)
+    reader = RowReader(Payment, PaymentResponse)
+    return reader.response(FinanceService.get_all_payments(db, reader, current_user.school_id))
 
 @router.get("/stats")
 def get_finance_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """
@@ -95,13 +134,31 @@ def get_finance_stats(
 # --- Balances ---
 
 @router.get("/balance/{student_id}", response_model=FeeBalanceResponse)
-def get_student_balance(
+async def get_student_balance(
     student_id: UUID,
     term_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user = Depends(get_current_user)
 ):
     """
     Calculate real-time fee balance for a student.
     """
-    return FinanceService.get_student_fee_balance(db, student_id, term_id)
+    return await FinanceService.get_student_fee_balance(db, student_id, term_id)
+
+
+@router.get("/balances", response_model=List[ClassroomFeeBalanceResponse])
+async def get_classroom_balances(
+    classroom_id: UUID,
+    term_id: UUID,
+    balance_status: Optional[str] = Query(None, alias="status", pattern="^(paid|partial|pending)$"),
+    sort: str = Query("balance_desc", pattern="^(balance_desc|balance_asc)$"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Fee balances for every student in a classroom for a term.
+    Optionally filter by status and sort by outstanding balance.
+    """
+    if current_user.role not in ["super_admin", "school_admin", "bursar"]:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return await FinanceService.get_classroom_fee_balances(db, classroom_id, term_id, status_filter=balance_status, sort=sort)
@@ -1,18 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from uuid import UUID
 
-from app.db.database import get_db
+from app.db.replicas import get_read_db
 from app.api.v1.auth import get_current_user
 from app.services.finance_report_service import FinanceReportService
+from app.services.document_cache import document_cache
 
 router = APIRouter(prefix="/finance-reports", tags=["Financial Reporting"])
 
 @router.get("/receipt/{payment_id}")
 def download_receipt(
     payment_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """
@@ -22,10 +23,11 @@ def download_receipt(
     if current_user.role not in ["super_admin", "school_admin", "bursar", "student"]:
         raise HTTPException(status_code=403, detail="Forbidden")
         
-    pdf_buffer = FinanceReportService.generate_payment_receipt(db, payment_id)
+    data = FinanceReportService.get_receipt_data(db, payment_id)
     
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=receipt_{payment_id}.pdf"}
+    # ETag = hash of the receipt data, so repeat downloads are a 304 or a file read
+    return document_cache.pdf_response(
+        request, "payment_receipt", data,
+        FinanceReportService.render_payment_receipt,
+        filename=f"receipt_{payment_id}.pdf"
     )
@@ -4,11 +4,15 @@ from typing import List
 from uuid import UUID
 
 from app.db.database import get_db
+from app.db.replicas import get_read_db
 from app.api.v1.auth import get_current_user
-from app.schemas.performance import AssessmentCreate, AssessmentResponse, GradeBulkCreate, GradeResponse
+from app.schemas.performance import AssessmentCreate, AssessmentResponse, GradeBulkCreate, GradeResponse, GradebookResponse
 from app.services.grade_service import GradeService
+from app.services.gradebook_service import GradebookService
+from app.utils.msgpack_route import MsgPackRoute
 
-router = APIRouter(prefix="/grades", tags=["Grade Management"])
+# Bulk endpoints also take application/msgpack bodies
+router = APIRouter(prefix="/grades", tags=["Grade Management"], route_class=MsgPackRoute)
 
 @router.post("/assessments", response_model=AssessmentResponse, status_code=status.HTTP_201_CREATED)
 def create_assessment(
@@ -31,7 +35,24 @@ def bulk_enter_grades(
 ):
     """
     Batch enter grades for students in an assessment.
+    Accepts JSON or application/msgpack bodies.
     """
     if current_user.role not in ["super_admin", "school_admin", "teacher"]:
         raise HTTPException(status_code=403, detail="Forbidden")
     return GradeService.bulk_enter_grades(db, data)
+
+
+@router.get("/gradebook/{classroom_id}", response_model=GradebookResponse)
+def get_classroom_gradebook(
+    classroom_id: UUID,
+    term_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    End-of-term results for a whole classroom: marks matrix, subject
+    percentages, overall averages, pass/fail and class positions.
+    """
+    if current_user.role not in ["super_admin", "school_admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return GradebookService.build_classroom_gradebook(db, classroom_id, term_id)
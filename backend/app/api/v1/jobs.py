@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from app.db.database import get_db
+from app.api.v1.auth import get_current_user
+from app.schemas.job import JobCreate, JobResponse
+from app.services.job_service import JobService
+
+router = APIRouter(prefix="/jobs", tags=["Background Jobs"])
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_job(data: JobCreate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """
+    Queue a heavy report (report cards, receipts) for background processing.
+    Poll GET /jobs/{id} and download from GET /jobs/{id}/result when completed.
+    """
+    return JobService.submit_job(db, current_user, data)
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job_status(job_id: UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    return JobService.get_job(db, current_user, job_id)
+
+@router.get("/{job_id}/result")
+def download_job_result(job_id: UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    job = JobService.get_job_result(db, current_user, job_id)
+    return FileResponse(job.result_path, media_type=job.result_media_type, filename=job.result_filename)
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(job_id: UUID, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    return JobService.cancel_job(db, current_user, job_id)
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 from io import BytesIO
 
-from app.db.database import get_db
+from app.db.replicas import get_read_db
 from app.api.v1.auth import get_current_user
 from app.services.report_service import ReportService
+from app.services.document_cache import document_cache
 
 router = APIRouter(prefix="/reports", tags=["Reporting"])
 
@@ -14,7 +15,8 @@ router = APIRouter(prefix="/reports", tags=["Reporting"])
 def get_report_card(
     student_id: UUID,
     term_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """
@@ -23,10 +25,36 @@ def get_report_card(
     # Authorization check... 
     # (Simplified: check if student belongs to same school as user)
     
-    pdf_buffer = ReportService.generate_student_report_card(db, student_id, term_id)
+    data = ReportService.get_report_card_data(db, student_id, term_id)
     
+    # ETag = hash of the report card data, so repeat downloads are a 304 or a file read
+    return document_cache.pdf_response(
+        request, "report_card", data,
+        ReportService.render_report_card,
+        filename=f"report_card_{student_id}.pdf"
+    )
+
+
+@router.get("/report-cards/classroom/{classroom_id}")
+def get_classroom_report_cards(
+    classroom_id: UUID,
+    term_id: UUID,
+    output: str = Query("zip", alias="format", pattern="^(zip|pdf)$"),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Generate report cards for a whole classroom.
+    format=zip returns one PDF per student, format=pdf a single merged PDF.
+    """
+    if current_user.role not in ["super_admin", "school_admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    
+    buffer = ReportService.generate_classroom_report_cards(db, classroom_id, term_id, output)
+    
+    media_type = "application/pdf" if output == "pdf" else "application/zip"
     return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=report_card_{student_id}.pdf"}
+        buffer,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=report_cards_{classroom_id}.{output}"}
     )
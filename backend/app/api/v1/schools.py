@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
 
 from app.db.database import get_db
+from app.db.pagination import KeysetPage, PageParams, page_params, page_response
 from app.schemas.school import SchoolCreate, SchoolUpdate, SchoolResponse
 from app.services.school_service import SchoolService
+from app.models.school import School
 from app.api.v1.auth import get_current_user
 
 router = APIRouter(prefix="/schools", tags=["Schools"])
@@ -29,13 +31,13 @@ def create_school(
 
 @router.get("/", response_model=List[SchoolResponse])
 def get_schools(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    params: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
-    List all schools.
+    List all schools, one page at a time (follow X-Next-Cursor).
     Only super_admin can list all schools.
     """
     if current_user.role != "super_admin":
@@ -43,7 +45,8 @@ def get_schools(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only super admins can view all schools"
         )
-    return SchoolService.get_all_schools(db, skip=skip, limit=limit)
+    page = KeysetPage(School, SchoolResponse, params)
+    return page_response(request, SchoolService.get_all_schools(db, page))
 
 @router.get("/{school_id}", response_model=SchoolResponse)
 def get_school(
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 
 from app.db.database import get_db
+from app.db.pagination import KeysetPage, PageParams, page_params, page_response
+from app.db.replicas import get_async_read_db
 from app.api.v1.auth import get_current_user
 from app.schemas.student import StudentCreate, StudentResponse, EnrollmentCreate, EnrollmentResponse
 from app.services.student_service import StudentService
+from app.models.student import Student
 
 router = APIRouter(prefix="/students", tags=["Student Management"])
 
@@ -17,12 +21,18 @@ def create_student(data: StudentCreate, db: Session = Depends(get_db), current_u
     return StudentService.create_student(db, current_user.school_id, data)
 
 @router.get("/", response_model=List[StudentResponse])
-def get_students(
+async def get_students(
+    request: Request,
     classroom_id: Optional[UUID] = None,
-    db: Session = Depends(get_db), 
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db), 
     current_user = Depends(get_current_user)
 ):
-    return StudentService.get_students(db, current_user.school_id, classroom_id)
+    """
+    One page of students (follow X-Next-Cursor); `fields=` picks the columns.
+    """
+    page = KeysetPage(Student, StudentResponse, params)
+    return page_response(request, await StudentService.get_students(db, current_user.school_id, page, classroom_id))
 
 @router.post("/enroll", response_model=EnrollmentResponse)
 def enroll_student(data: EnrollmentCreate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
@@ -7,6 +7,7 @@ from app.db.database import get_db
 from app.api.v1.auth import get_current_user
 from app.schemas.subject import SubjectCreate, SubjectResponse, TeacherAssignmentCreate, TeacherAssignmentResponse
 from app.services.subject_service import SubjectService
+from app.services.response_cache import response_cache
 
 router = APIRouter(prefix="/subjects", tags=["Subject & Teacher Management"])
 
@@ -17,8 +18,12 @@ def create_subject(data: SubjectCreate, db: Session = Depends(get_db), current_u
     return SubjectService.create_subject(db, current_user.school_id, data)
 
 @router.get("/", response_model=List[SubjectResponse])
-def get_subjects(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    return SubjectService.get_subjects(db, current_user.school_id)
+def get_subjects(request: Request, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    return response_cache.respond(
+        request, "subjects", current_user.school_id,
+        lambda: SubjectService.get_subjects(db, current_user.school_id),
+        List[SubjectResponse]
+    )
 
 @router.post("/assign-teacher", response_model=TeacherAssignmentResponse)
 def assign_teacher(data: TeacherAssignmentCreate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
@@ -1,28 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db
+from app.db.pagination import KeysetPage, PageParams, page_params, page_response
 from app.api.v1.auth import get_current_user
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, UserUpdate
+from app.services.auth_service import AuthService
 from app.models.user import User
 
 router = APIRouter(prefix="/users", tags=["User Management"])
 
 @router.get("/", response_model=List[UserResponse])
-def get_users(
+async def get_users(
+    request: Request,
     role: Optional[str] = None,
-    db: Session = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
     """
-    List users in the school.
+    List users in the school, one page at a time (follow X-Next-Cursor).
     Allows filtering by role (e.g., teacher, bursar).
     """
-    query = db.query(User).filter(User.school_id == current_user.school_id)
+    page = KeysetPage(User, UserResponse, params)
+    query = page.select().where(User.school_id == current_user.school_id)
     
     if role:
-        query = query.filter(User.role == role)
+        query = query.where(User.role == role)
         
-    return query.all()
+    return page_response(request, await page.fetch_async(db, query))
+
+@router.patch("/{user_id}", response_model=UserResponse)
+def update_user(
+    user_id: UUID,
+    user_data: UserUpdate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Update a user, including their role or active status.
+    Only admins.
+    """
+    if current_user.role not in ["super_admin", "school_admin"]:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return AuthService.update_user(db, current_user, user_id, user_data)
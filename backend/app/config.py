@@ -18,12 +18,77 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Database connection pool - applies to both the sync and async engine, so
+    # each API process can hold up to 2 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection before erroring
+    DB_POOL_RECYCLE: int = 1800  # Replace connections older than this many seconds (-1 = never)
+    
+    # Readiness probe (GET /health/ready)
+    READINESS_DB_TIMEOUT: float = 2.0  # Seconds allowed for the DB round trip
+    READINESS_MAX_POOL_SATURATION: float = 0.9  # Share of pool capacity in use before we report not ready
+    
+    # Read replicas - read-only endpoints and report jobs are spread over these
+    READ_REPLICA_URLS: list = []
+    REPLICA_EJECT_SECONDS: int = 30  # How long a failing replica is skipped
+    REPLICA_PIN_SECONDS: int = 5  # Reads stay on the primary this long after a client writes
+    
+    # Per-request SQL stats (Server-Timing header, GET /admin/query-stats)
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_STATS_WINDOW: int = 500  # Recent requests kept per route
+    N_PLUS_ONE_THRESHOLD: int = 10  # Same statement this many times in one request = likely N+1 (0 = off)
+    N_PLUS_ONE_RAISE: bool = False  # Raise instead of logging a warning - turn on in tests
+    
+    # Identity cache - verified tokens and user snapshots held in memory
+    IDENTITY_CACHE_TTL: int = 60  # Seconds a user snapshot is trusted (0 = always hit the DB)
+    IDENTITY_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Password hashing - bcrypt cost and the process pool that runs it
+    BCRYPT_ROUNDS: int = 12  # Existing hashes with another cost are rehashed on next login
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one per CPU core
+    PASSWORD_HASH_QUEUE_SIZE: int = 256  # Hashes queued or running before logins get a 503
+    
     # Application
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
     PROJECT_NAME: str = "School Management System"
     VERSION: str = "1.0.0"
     
+    # Reporting - PDF render processes for batch report cards (0 = one per CPU core)
+    REPORT_WORKERS: int = 0
+    
+    # Background jobs - worker threads per process (0 = don't process jobs here)
+    JOB_WORKERS: int = 2
+    JOB_MAX_PER_SCHOOL: int = 1  # Running jobs per school, so one tenant can't starve others
+    JOB_POLL_INTERVAL: float = 1.0  # Seconds between queue checks when idle
+    JOB_RESULTS_DIR: str = "job_results"
+    JOB_RESULT_TTL: int = 86400  # Seconds a finished job's result file is kept
+    JOB_HEARTBEAT_INTERVAL: float = 15.0  # Seconds between heartbeats from a running job
+    JOB_LEASE_TIMEOUT: float = 120.0  # A running job without a heartbeat for this long is presumed dead
+    JOB_MAX_ATTEMPTS: int = 3  # Runs before a repeatedly abandoned job is marked failed
+    
+    # Rendered PDF cache (report cards, receipts)
+    DOCUMENT_CACHE_DIR: str = "document_cache"
+    DOCUMENT_CACHE_MAX_MB: int = 512
+    
+    # Reference-data response cache (subjects, classrooms, years, terms, fee structures)
+    RESPONSE_CACHE_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared by all workers)
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_REDIS_TIMEOUT: float = 0.5  # Seconds before a Redis call gives up and the request is served uncached
+    RESPONSE_CACHE_TTL: int = 300  # Seconds; also bounds staleness across workers with the memory backend
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    
+    # List endpoints - page size for keyset (cursor) pagination
+    PAGE_DEFAULT_LIMIT: int = 100
+    PAGE_MAX_LIMIT: int = 1000
+    STREAM_BATCH_SIZE: int = 1000  # Rows fetched per round trip when streaming NDJSON
+    
+    # Response compression (brotli when the client accepts it and the package is installed, else gzip)
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller bodies aren't worth the CPU
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4  # 0-11; higher is smaller but much slower to compress
+    
     # CORS - Allow frontend to connect
     ALLOWED_ORIGINS: list = [
         "http://localhost:3000",
@@ -1,21 +1,45 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import get_settings
+from app.db.pool_metrics import PoolMetrics, instrument_engine, instrumented_pool_class
 
 settings = get_settings()
 
+def pool_options(url: str, pool_class, metrics: PoolMetrics) -> dict:
+    """
+    Sized, instrumented connection pool settings from Settings.
+    SQLite keeps SQLAlchemy's default pools; there's no server connection limit to size against.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": instrumented_pool_class(pool_class, metrics),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
 # Create database engine
 # echo=True means it will print SQL queries (useful for debugging)
-# Create database engine
 connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
 
+# Pool metrics for each engine, served by GET /admin/db-pool
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,
-    connect_args=connect_args
+    connect_args=connect_args,
+    **pool_options(settings.DATABASE_URL, QueuePool, sync_pool_metrics)
 )
+instrument_engine(engine, sync_pool_metrics)
 
 # Session factory - creates database sessions
 SessionLocal = sessionmaker(
@@ -24,6 +48,44 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async drivers for the same database, used by the async API endpoints
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """
+    Swap the sync driver in DATABASE_URL for its async counterpart,
+    e.g. postgresql://... -> postgresql+asyncpg://...
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    query = dict(parsed.query)
+    if backend.startswith("postgres") and "sslmode" in query:
+        # asyncpg spells libpq's sslmode as ssl
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend], query=query).render_as_string(hide_password=False)
+
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+    **pool_options(settings.DATABASE_URL, AsyncAdaptedQueuePool, async_pool_metrics)
+)
+instrument_engine(async_engine.sync_engine, async_pool_metrics)
+
+# expire_on_commit=False: async sessions can't lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for all models
 Base = declarative_base()
 
@@ -41,4 +103,16 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """
+    Async version of get_db, for `async def` endpoints.
+    
+    Usage in FastAPI:
+    @app.get("/students")
+    async def get_students(db: AsyncSession = Depends(get_async_db)):
+        ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,155 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from datetime import datetime
+from fastapi import HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Type, Union
+from uuid import UUID
+import orjson
+
+from app.config import get_settings
+from app.db.rows import RowReader
+
+settings = get_settings()
+
+# ==========================================
+# Cursors - opaque to clients, (created_at, id) of the last row served
+# ==========================================
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+# ==========================================
+# Request parameters
+# ==========================================
+
+NDJSON = "application/x-ndjson"
+
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+    fields: Optional[List[str]]
+    stream: bool = False
+
+def page_params(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,admission_number")
+) -> PageParams:
+    """
+    Dependency for paginated list endpoints.
+    
+    With "Accept: application/x-ndjson" the whole list (after `cursor`, if
+    given) is streamed one row per line instead, and `limit` is ignored.
+    """
+    names = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    stream = NDJSON in request.headers.get("accept", "")
+    return PageParams(cursor=cursor, limit=limit, fields=names, stream=stream)
+
+# ==========================================
+# Keyset pages
+# ==========================================
+
+@dataclass
+class Page:
+    items: List[dict]
+    next_cursor: Optional[str]
+
+@dataclass
+class StreamedPage:
+    chunks: Union[Iterator[bytes], AsyncIterator[bytes]]
+
+class KeysetPage(RowReader):
+    """
+    One page of a list, ordered by (created_at, id).
+    
+    Reads plain column rows like RowReader (only the requested fields plus
+    the two keys), never ORM objects. Continuing from a cursor is a
+    "WHERE (created_at, id) > (...)" index seek, which costs the same on
+    page 1000 as on page 1 - unlike OFFSET.
+    
+    When streaming (NDJSON), there is no limit: rows are read from a
+    server-side cursor STREAM_BATCH_SIZE at a time and sent as they arrive,
+    so memory stays flat however long the list is.
+    
+    Usage in a service:
+        stmt = page.select().where(Model.school_id == school_id)
+        return page.fetch(db, stmt)  # or: await page.fetch_async(db, stmt)
+    """
+    
+    def __init__(self, model, schema: Type[BaseModel], params: PageParams):
+        super().__init__(model, schema, params.fields)
+        self.limit = params.limit
+        self.stream = params.stream
+        self.after = decode_cursor(params.cursor) if params.cursor else None
+    
+    def select(self) -> Select:
+        keys = (self.model.created_at, self.model.id)
+        stmt = super().select(
+            self.model.created_at.label("_cursor_created_at"),
+            self.model.id.label("_cursor_id")
+        )
+        if self.after:
+            stmt = stmt.where(tuple_(*keys) > tuple_(*self.after))
+        stmt = stmt.order_by(*keys)
+        if self.stream:
+            return stmt.execution_options(yield_per=settings.STREAM_BATCH_SIZE)
+        # One extra row tells us whether there is a next page
+        return stmt.limit(self.limit + 1)
+    
+    def fetch(self, db: Session, stmt: Select) -> Union[Page, StreamedPage]:
+        if self.stream:
+            partitions = db.execute(stmt).partitions()
+            return StreamedPage(chunks=(self.render_ndjson(rows) for rows in partitions))
+        return self.collect(db.execute(stmt).all())
+    
+    async def fetch_async(self, db: AsyncSession, stmt: Select) -> Union[Page, StreamedPage]:
+        if self.stream:
+            result = await db.stream(stmt)
+            return StreamedPage(chunks=self._render_partitions(result))
+        return self.collect((await db.execute(stmt)).all())
+    
+    async def _render_partitions(self, result):
+        async for rows in result.partitions():
+            yield self.render_ndjson(rows)
+    
+    def collect(self, rows) -> Page:
+        rows = list(rows)
+        next_cursor = None
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last._cursor_created_at, last._cursor_id)
+        return Page(items=self.to_dicts(rows), next_cursor=next_cursor)
+
+def page_response(request: Request, page: Union[Page, StreamedPage]) -> Response:
+    """
+    The page as a plain JSON array (so existing clients keep working), with
+    the next cursor in X-Next-Cursor and a Link: rel="next" header.
+    Or, for a streamed page, an NDJSON stream.
+    """
+    if isinstance(page, StreamedPage):
+        return StreamingResponse(page.chunks, media_type=NDJSON)
+    
+    headers = {}
+    if page.next_cursor:
+        next_url = request.url.include_query_params(cursor=page.next_cursor)
+        headers["X-Next-Cursor"] = page.next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    return Response(content=orjson.dumps(page.items), media_type="application/json", headers=headers)
@@ -0,0 +1,129 @@
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+from bisect import bisect_left
+from typing import Type
+import threading
+import time
+
+from app.utils.metrics import DB_POOL_CHECKOUT_DURATION, DB_POOL_TIMEOUTS, DB_POOL_IN_USE, DB_POOL_OPEN
+
+# Upper bounds (ms) of the checkout latency histogram buckets; the last bucket is unbounded
+CHECKOUT_LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class PoolMetrics:
+    """
+    Counters for one connection pool.
+    
+    Checkout latency is the time from asking the pool for a connection to
+    getting one: waiting for a free slot, opening a new connection and the
+    pre-ping all count. Connection churn comes from pool events.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.connections_invalidated = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_buckets = [0] * (len(CHECKOUT_LATENCY_BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+    
+    def observe_checkout(self, seconds: float):
+        ms = seconds * 1000
+        with self._lock:
+            self.latency_sum += seconds
+            self.latency_max = max(self.latency_max, seconds)
+            self.latency_buckets[bisect_left(CHECKOUT_LATENCY_BUCKETS_MS, ms)] += 1
+        DB_POOL_CHECKOUT_DURATION.labels(self.name).observe(seconds)
+    
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            observed = sum(self.latency_buckets)
+            stats = {
+                "name": self.name,
+                "pool_class": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+                "connections_closed": self.connections_closed,
+                "connections_invalidated": self.connections_invalidated,
+                "checkout_latency": {
+                    "count": observed,
+                    "avg_ms": round(self.latency_sum / observed * 1000, 3) if observed else 0.0,
+                    "max_ms": round(self.latency_max * 1000, 3),
+                    "buckets": {
+                        f"le_{bound}ms": count
+                        for bound, count in zip(CHECKOUT_LATENCY_BUCKETS_MS, self.latency_buckets)
+                    } | {"le_inf": self.latency_buckets[-1]},
+                },
+            }
+        
+        # Live occupancy straight from the pool (QueuePool and its async variant)
+        if hasattr(pool, "checkedout"):
+            stats.update({
+                "size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            })
+        return stats
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Subclass `base` so every checkout is timed.
+    Metrics are bound to the class, so they survive pool.recreate() on dispose.
+    """
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except PoolTimeoutError:
+            metrics.increment("timeouts")
+            DB_POOL_TIMEOUTS.labels(metrics.name).inc()
+            raise
+        metrics.observe_checkout(time.perf_counter() - start)
+        return connection
+    
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
+
+def instrument_engine(engine, metrics: PoolMetrics):
+    """
+    Count checkouts, checkins and connection churn through pool events.
+    Pass an Engine (for async engines, its .sync_engine).
+    """
+    in_use = DB_POOL_IN_USE.labels(metrics.name)
+    open_connections = DB_POOL_OPEN.labels(metrics.name)
+    
+    def on_checkout(*args):
+        metrics.increment("checkouts")
+        in_use.inc()
+    
+    def on_checkin(*args):
+        metrics.increment("checkins")
+        in_use.dec()
+    
+    def on_connect(*args):
+        metrics.increment("connections_opened")
+        open_connections.inc()
+    
+    def on_close(*args):
+        metrics.increment("connections_closed")
+        open_connections.dec()
+    
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "close", on_close)
+    event.listen(engine, "invalidate", lambda *args: metrics.increment("connections_invalidated"))
@@ -0,0 +1,128 @@
+from collections import Counter, deque
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Dict, Optional
+import logging
+import re
+import threading
+import time
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class NPlusOneError(Exception):
+    """
+    Raised (when N_PLUS_ONE_RAISE is on) as soon as a request repeats one
+    statement shape N_PLUS_ONE_THRESHOLD times - so tests fail at the loop.
+    """
+
+# IN lists vary in length with the data, not the code path
+_IN_LIST = re.compile(r"\bIN \((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+class RequestQueryStats:
+    """
+    SQL issued while serving one request.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+        self.suspected_n_plus_one: Dict[str, int] = {}
+    
+    def record(self, duration: float):
+        self.count += 1
+        self.duration += duration
+    
+    def check_shape(self, statement: str):
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        repeats = self.shapes[shape]
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        if threshold and repeats >= threshold:
+            self.suspected_n_plus_one[shape] = repeats
+            if repeats == threshold:
+                if settings.N_PLUS_ONE_RAISE:
+                    raise NPlusOneError(f"Statement repeated {repeats} times in one request: {shape[:200]}")
+                logger.warning("Possible N+1: statement repeated %s times in one request: %s", repeats, shape[:200])
+    
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+def start_request() -> RequestQueryStats:
+    """
+    Begin counting queries for the current request (and anything it awaits,
+    runs in the threadpool or runs on the async engine).
+    """
+    stats = RequestQueryStats()
+    _current.set(stats)
+    return stats
+
+# ==========================================
+# SQLAlchemy hooks - every engine (primary, async, replicas)
+# ==========================================
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.check_shape(statement)
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_start")
+    if stats is not None and starts:
+        stats.record(time.perf_counter() - starts.pop())
+
+# ==========================================
+# Rolling per-route table
+# ==========================================
+
+class RouteQueryStats:
+    """
+    Query counts and DB time for the last QUERY_STATS_WINDOW requests of each route.
+    """
+    
+    def __init__(self, window: int):
+        self.window = window
+        self._routes: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, route: str, stats: RequestQueryStats, elapsed: float):
+        sample = (stats.count, stats.duration, elapsed, bool(stats.suspected_n_plus_one))
+        with self._lock:
+            samples = self._routes.get(route)
+            if samples is None:
+                samples = self._routes[route] = deque(maxlen=self.window)
+            samples.append(sample)
+    
+    def table(self) -> list:
+        with self._lock:
+            routes = {route: list(samples) for route, samples in self._routes.items()}
+        
+        rows = []
+        for route, samples in routes.items():
+            counts = [count for count, _, _, _ in samples]
+            rows.append({
+                "route": route,
+                "requests": len(samples),
+                "avg_queries": round(sum(counts) / len(samples), 2),
+                "max_queries": max(counts),
+                "avg_db_ms": round(sum(db for _, db, _, _ in samples) / len(samples) * 1000, 2),
+                "avg_total_ms": round(sum(total for _, _, total, _ in samples) / len(samples) * 1000, 2),
+                "n_plus_one_requests": sum(1 for _, _, _, flagged in samples if flagged),
+            })
+        return sorted(rows, key=lambda row: row["avg_queries"], reverse=True)
+
+route_query_stats = RouteQueryStats(settings.QUERY_STATS_WINDOW)
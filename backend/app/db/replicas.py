@@ -0,0 +1,196 @@
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Dict, List, Optional
+import itertools
+import logging
+import threading
+import time
+
+from app.config import get_settings
+from app.db.database import SessionLocal, AsyncSessionLocal, get_async_database_url, pool_options
+from app.db.pool_metrics import PoolMetrics, instrument_engine
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class Replica:
+    """
+    One read replica: a sync and an async engine with their session factories.
+    """
+    
+    def __init__(self, index: int, url: str):
+        self.name = f"replica-{index}"
+        self.ejected_until = 0.0
+        self.ejections = 0
+        
+        self.pool_metrics = PoolMetrics(self.name)
+        self.async_pool_metrics = PoolMetrics(f"{self.name}-async")
+        self.engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+            **pool_options(url, QueuePool, self.pool_metrics)
+        )
+        self.async_engine = create_async_engine(
+            get_async_database_url(url),
+            pool_pre_ping=True,
+            **pool_options(url, AsyncAdaptedQueuePool, self.async_pool_metrics)
+        )
+        instrument_engine(self.engine, self.pool_metrics)
+        instrument_engine(self.async_engine.sync_engine, self.async_pool_metrics)
+        
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.AsyncSessionLocal = async_sessionmaker(
+            self.async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+class ReplicaRouter:
+    """
+    Sends read-only sessions to read replicas, round-robin.
+    
+    A replica that fails to connect (or drops its connection) is ejected
+    for REPLICA_EJECT_SECONDS, then tried again. With no healthy replica,
+    or none configured, reads go to the primary.
+    
+    Read-after-write: clients that just made a write are pinned to the
+    primary for REPLICA_PIN_SECONDS (covering replication lag), so they
+    always see their own changes. Pins are per process.
+    """
+    
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(i, url) for i, url in enumerate(urls)]
+        self._next = itertools.cycle(self.replicas)
+        self._pins: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        
+        for replica in self.replicas:
+            event.listen(replica.engine, "handle_error", self._error_handler(replica))
+            event.listen(replica.async_engine.sync_engine, "handle_error", self._error_handler(replica))
+    
+    def choose(self, client_key: Optional[str] = None) -> Optional[Replica]:
+        """
+        Next healthy replica, or None to use the primary.
+        """
+        if not self.replicas or (client_key and self.is_pinned(client_key)):
+            return None
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = next(self._next)
+                if replica.healthy:
+                    return replica
+        return None
+    
+    def eject(self, replica: Replica):
+        with self._lock:
+            if replica.healthy:
+                replica.ejections += 1
+                logger.warning("Ejecting %s for %ss", replica.name, settings.REPLICA_EJECT_SECONDS)
+            replica.ejected_until = time.monotonic() + settings.REPLICA_EJECT_SECONDS
+    
+    def pin_to_primary(self, client_key: str):
+        now = time.monotonic()
+        with self._lock:
+            self._pins[client_key] = now + settings.REPLICA_PIN_SECONDS
+            # Drop expired pins now and then so the map stays small
+            if len(self._pins) > 10000:
+                self._pins = {key: until for key, until in self._pins.items() if until > now}
+    
+    def is_pinned(self, client_key: str) -> bool:
+        until = self._pins.get(client_key)
+        return until is not None and until > time.monotonic()
+    
+    def session(self, client_key: Optional[str] = None) -> Session:
+        """
+        A sync read-only session, on a replica if one is healthy.
+        Connects eagerly, so a dead replica is ejected and we fall back to the primary.
+        """
+        replica = self.choose(client_key)
+        if replica is None:
+            return SessionLocal()
+        db = replica.SessionLocal()
+        try:
+            db.connection()
+        except DBAPIError:
+            db.close()
+            self.eject(replica)
+            return SessionLocal()
+        return db
+    
+    async def async_session(self, client_key: Optional[str] = None) -> AsyncSession:
+        replica = self.choose(client_key)
+        if replica is None:
+            return AsyncSessionLocal()
+        db = replica.AsyncSessionLocal()
+        try:
+            await db.connection()
+        except DBAPIError:
+            await db.close()
+            self.eject(replica)
+            return AsyncSessionLocal()
+        return db
+    
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "ejections": replica.ejections,
+                "pools": [
+                    replica.pool_metrics.snapshot(replica.engine.pool),
+                    replica.async_pool_metrics.snapshot(replica.async_engine.sync_engine.pool),
+                ],
+            }
+            for replica in self.replicas
+        ]
+    
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+    
+    async def dispose_async(self):
+        for replica in self.replicas:
+            await replica.async_engine.dispose()
+    
+    def _error_handler(self, replica: Replica):
+        def handle_error(context):
+            # Couldn't connect, or the connection died mid-query (pre-ping failures retry on their own)
+            if not context.is_pre_ping and (context.connection is None or context.is_disconnect):
+                self.eject(replica)
+        return handle_error
+
+replica_router = ReplicaRouter(settings.READ_REPLICA_URLS)
+
+def client_key(request: Request) -> Optional[str]:
+    """
+    Identifies a client for read-after-write pinning: their bearer token.
+    """
+    return request.headers.get("authorization")
+
+def get_read_db(request: Request):
+    """
+    Like get_db, but for read-only endpoints: the session may be on a replica.
+    Never write through it.
+    """
+    db = replica_router.session(client_key(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    """
+    Async version of get_read_db.
+    """
+    db = await replica_router.async_session(client_key(request))
+    try:
+        yield db
+    finally:
+        await db.close()
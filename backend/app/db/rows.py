@@ -0,0 +1,62 @@
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+from typing import Dict, List, Optional, Type
+import orjson
+
+class RowReader:
+    """
+    Read path for heavy list endpoints that skips the ORM.
+    
+    Selects just the columns named by the response schema's fields (or the
+    `fields` subset), as plain Core rows - no identity map, no ORM objects.
+    Each field is a column of the same name and type, so the shape is
+    guaranteed and rows are rendered with orjson directly instead of being
+    re-validated through the response model.
+    
+    Usage in a service:
+        reader = RowReader(Model, ModelResponse)
+        rows = db.execute(reader.select().where(Model.school_id == school_id)).all()
+    and in the router:
+        return reader.response(rows)
+    """
+    
+    def __init__(self, model, schema: Type[BaseModel], fields: Optional[List[str]] = None):
+        self.model = model
+        
+        available = list(schema.model_fields)
+        if fields:
+            unknown = [name for name in fields if name not in available]
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}"
+                )
+            self.fields = [name for name in available if name in fields]
+        else:
+            self.fields = available
+    
+    def select(self, *extra) -> Select:
+        """
+        SELECT the fields' columns, followed by any `extra` columns (not rendered).
+        """
+        return select(*(getattr(self.model, name) for name in self.fields), *extra)
+    
+    def to_dicts(self, rows) -> List[Dict]:
+        fields = self.fields
+        width = len(fields)
+        return [dict(zip(fields, row[:width])) for row in rows]
+    
+    def render(self, rows) -> bytes:
+        return orjson.dumps(self.to_dicts(rows))
+    
+    def render_ndjson(self, rows) -> bytes:
+        """
+        One JSON object per line (application/x-ndjson).
+        """
+        return b"".join(orjson.dumps(item) + b"\n" for item in self.to_dicts(rows))
+    
+    def response(self, rows, headers: Optional[dict] = None) -> Response:
+        return Response(content=self.render(rows), media_type="application/json", headers=headers)
@@ -0,0 +1,36 @@
+from itertools import islice
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Rows per multi-row statement. Keeps every statement under the bound-parameter
+# limits of SQLite (32766) and Postgres (65535) for our widest tables.
+UPSERT_CHUNK_SIZE = 1000
+
+def upsert_insert(db: Session, model):
+    """
+    Build a dialect-specific INSERT for `model` that supports ON CONFLICT.
+
+    Postgres and SQLite expose the same `on_conflict_do_update` API,
+    so services can write one multi-row upsert for both.
+
+    Usage:
+        stmt = upsert_insert(db, Attendance).values(rows)
+        stmt = stmt.on_conflict_do_update(index_elements=[...], set_={...})
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Bulk upsert is not supported on '{dialect}'")
+
+def chunked(rows, size: int = UPSERT_CHUNK_SIZE):
+    """
+    Yield lists of at most `size` items from any iterable.
+    """
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -1,13 +1,28 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.config import get_settings
+from app.db.database import async_engine
+from app.db.replicas import replica_router, client_key
+from app.db.query_stats import start_request, route_query_stats
+from app.services.report_service import shutdown_render_pool
+from app.services.job_service import start_job_workers, stop_job_workers
+from app.services.health_service import HealthService
+from app.utils.security import shutdown_hash_pool
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import (
+    HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_IN_FLIGHT, DB_QUERIES,
+    render_metrics, mark_process_dead
+)
 
 # Import routers
 from app.api.v1 import (
     auth, schools, academic, 
     students, subjects, attendance, 
     grades, reports, finance, 
-    finance_reports, users
+    finance_reports, users, jobs,
+    admin
 )
 
 settings = get_settings()
@@ -19,6 +34,8 @@ app = FastAPI(
     description="A comprehensive school management platform",
     docs_url="/docs",
     redoc_url="/redoc",
+    # orjson serializes large lists several times faster than json.dumps
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Middleware - Allows frontend to make requests
@@ -28,8 +45,85 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paginated lists advertise the next page in these headers
+    expose_headers=["X-Next-Cursor", "Link"],
+)
+
+# Brotli/gzip for large JSON responses
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
 )
 
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    """
+    After a successful write, keep the client's reads on the primary
+    for a few seconds so replica lag never hides their own changes.
+    """
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        key = client_key(request)
+        if key and replica_router.replicas:
+            replica_router.pin_to_primary(key)
+    return response
+
+@app.on_event("startup")
+def start_worker_pools():
+    """
+    Start the background job workers.
+    """
+    start_job_workers()
+
+@app.on_event("shutdown")
+def stop_worker_pools():
+    """
+    Stop background job workers, PDF render and password hashing processes.
+    """
+    stop_job_workers()
+    shutdown_render_pool()
+    shutdown_hash_pool()
+    replica_router.dispose()
+    mark_process_dead()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """
+    Close the async engines' pooled connections.
+    """
+    await async_engine.dispose()
+    await replica_router.dispose_async()
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """
+    Request count, latency and in-flight metrics for /metrics, plus SQL
+    statements and DB time per request (Server-Timing header, GET /admin/query-stats).
+    """
+    stats = start_request() if settings.QUERY_STATS_ENABLED else None
+    start = time.perf_counter()
+    status_code = 500
+    HTTP_IN_FLIGHT.inc()
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        elapsed = time.perf_counter() - start
+        # Label by route template, not raw path, to keep series bounded
+        route = request.scope.get("route")
+        route_key = route.path if route else "unmatched"
+        HTTP_REQUESTS.labels(request.method, route_key, status_code).inc()
+        HTTP_REQUEST_DURATION.labels(request.method, route_key).observe(elapsed)
+    
+    if stats is not None:
+        DB_QUERIES.labels(route_key).inc(stats.count)
+        route_query_stats.add(f"{request.method} {route_key}", stats, elapsed)
+        response.headers["Server-Timing"] = stats.server_timing()
+    return response
+
 # ==========================================
 # Basic Routes
 # ==========================================
@@ -48,16 +142,35 @@ async def root():
     }
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
     """
-    Detailed health check for monitoring.
+    Liveness probe: the process is up and its event loop is responding.
+    Deliberately touches no dependencies, so a DB outage doesn't get us restarted.
     """
     return {
         "status": "healthy",
         "environment": settings.ENVIRONMENT,
-        "database": "connected"
     }
 
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness probe: DB round trip latency, pool saturation and job backlog.
+    Returns 503 when this instance should be taken out of rotation.
+    """
+    ready, report = await HealthService.check_readiness()
+    return JSONResponse(report, status_code=200 if ready else 503)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus metrics, aggregated across worker processes when
+    PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 # ==========================================
 # Register API Routers
 # ==========================================
@@ -73,4 +186,6 @@ app.include_router(grades.router, prefix="/api/v1")
 app.include_router(reports.router, prefix="/api/v1")
 app.include_router(finance.router, prefix="/api/v1")
 app.include_router(finance_reports.router, prefix="/api/v1")
-app.include_router(users.router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(users.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
\ No newline at end of file
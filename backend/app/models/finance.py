@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Text, Uuid
+from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Text, Uuid, UniqueConstraint, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -31,6 +31,10 @@ class Payment(Base):
     Payment Model - Records a financial transaction made by a student.
     """
     __tablename__ = "payments"
+    __table_args__ = (
+        # Keyset pagination of a student's payment history
+        Index("ix_payments_student_created_at_id", "student_id", "created_at", "id"),
+    )
     
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
@@ -46,7 +50,32 @@ class Payment(Base):
     recorded_by_id = Column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     
     def __repr__(self):
         return f"<Payment Student:{self.student_id} Amount:{self.amount_paid} Date:{self.date}>"
+
+
+class StudentTermBalance(Base):
+    """
+    StudentTermBalance Model - Running fee ledger for a student in a term.
+    Updated in the same transaction as payments, fee structures and enrollments,
+    so reading a balance is a single-row lookup instead of summing payments.
+    """
+    __tablename__ = "student_term_balances"
+    __table_args__ = (
+        UniqueConstraint("student_id", "term_id", name="uq_balance_student_term"),
+    )
+    
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Uuid, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    term_id = Column(Uuid, ForeignKey("terms.id", ondelete="CASCADE"), nullable=False)
+    
+    total_fees = Column(Float, nullable=False, default=0.0) # From the fee structure of the student's classroom
+    total_paid = Column(Float, nullable=False, default=0.0) # Sum of payments for this term
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<StudentTermBalance Student:{self.student_id} Term:{self.term_id} Fees:{self.total_fees} Paid:{self.total_paid}>"
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, JSON, Uuid, Index
+from datetime import datetime
+import uuid
+
+from app.db.database import Base
+
+class Job(Base):
+    """
+    Job Model - A background task (report cards, receipts) processed off the request path.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Workers look for the oldest queued jobs
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
+    
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=True)
+    created_by_id = Column(Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    
+    kind = Column(String(50), nullable=False)  # report_card, classroom_report_cards, payment_receipt
+    params = Column(JSON, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, completed, failed, cancelled
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)  # Times a worker has claimed it
+    
+    # Result file on local disk
+    result_path = Column(String(500), nullable=True)
+    result_filename = Column(String(255), nullable=True)
+    result_media_type = Column(String(100), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # Last sign of life from the worker running it
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<Job {self.kind} ({self.status})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Date, Float, Integer, Uuid
+from sqlalchemy import Column, String, DateTime, ForeignKey, Date, Float, Integer, Uuid, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -10,6 +10,10 @@ class Attendance(Base):
     Attendance Model - Records daily attendance for students.
     """
     __tablename__ = "attendance"
+    __table_args__ = (
+        # One record per student per day - required for bulk upserts
+        UniqueConstraint("student_id", "date", name="uq_attendance_student_date"),
+    )
     
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
@@ -57,6 +61,10 @@ class Grade(Base):
     Grade Model - Stores the marks obtained by a student in an assessment.
     """
     __tablename__ = "grades"
+    __table_args__ = (
+        # One grade per student per assessment - required for bulk upserts
+        UniqueConstraint("student_id", "assessment_id", name="uq_grade_student_assessment"),
+    )
     
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     student_id = Column(Uuid, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
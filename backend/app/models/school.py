@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Uuid
+from sqlalchemy import Column, String, DateTime, Uuid, func
 from datetime import datetime
 import uuid
 
@@ -39,7 +39,7 @@ class School(Base):
     subscription_end_date = Column(DateTime, nullable=True)
     
     # Timestamps - When was this created/updated?
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def __repr__(self):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, ForeignKey, DateTime, Uuid
+from sqlalchemy import Column, String, Date, ForeignKey, DateTime, Uuid, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -10,6 +10,10 @@ class Student(Base):
     Student Model - Extended data for users with the 'student' role.
     """
     __tablename__ = "students"
+    __table_args__ = (
+        # Keyset pagination of a school's students
+        Index("ix_students_school_created_at_id", "school_id", "created_at", "id"),
+    )
     
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     user_id = Column(Uuid, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
@@ -21,6 +25,8 @@ class Student(Base):
     guardian_name = Column(String(200), nullable=True)
     guardian_phone = Column(String(20), nullable=True)
     
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    
     # Relationships
     # user = relationship("User", backref="student_profile")
     enrollments = relationship("Enrollment", back_populates="student", cascade="all, delete-orphan")
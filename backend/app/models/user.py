@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Uuid
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Uuid, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -17,6 +17,10 @@ class User(Base):
     - accountant: View financial reports
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination of a school's users
+        Index("ix_users_school_created_at_id", "school_id", "created_at", "id"),
+    )
     
     # Primary Key
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
@@ -39,7 +43,7 @@ class User(Base):
     
     # Timestamps
     last_login = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
@@ -59,3 +59,21 @@ class FeeBalanceResponse(BaseModel):
     total_paid: float
     balance: float
     status: str # paid, partial, pending
+
+
+class ClassroomFeeBalanceResponse(FeeBalanceResponse):
+    admission_number: str
+
+# ==========================================
+# Bulk Payment Import Schemas
+# ==========================================
+
+class PaymentImportError(BaseModel):
+    line: int # Line number in the uploaded file (header = line 1)
+    error: str
+
+class PaymentImportResult(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[PaymentImportError]
@@ -0,0 +1,54 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
+# ==========================================
+# Job Schemas
+# ==========================================
+
+class JobCreate(BaseModel):
+    kind: str = Field(..., description="report_card, classroom_report_cards, payment_receipt")
+    params: dict = Field(default_factory=dict)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "kind": "classroom_report_cards",
+                "params": {
+                    "classroom_id": "550e8400-e29b-41d4-a716-446655440000",
+                    "term_id": "550e8400-e29b-41d4-a716-446655440001",
+                    "format": "zip"
+                }
+            }
+        }
+    )
+
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    params: dict
+    status: str # queued, running, completed, failed, cancelled
+    error: Optional[str] = None
+    result_filename: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+# ==========================================
+# Job Parameter Schemas (one per kind)
+# ==========================================
+
+class ReportCardJobParams(BaseModel):
+    student_id: UUID
+    term_id: UUID
+
+class ClassroomReportCardsJobParams(BaseModel):
+    classroom_id: UUID
+    term_id: UUID
+    format: str = Field(default="zip", pattern="^(zip|pdf)$")
+
+class PaymentReceiptJobParams(BaseModel):
+    payment_id: UUID
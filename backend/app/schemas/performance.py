@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import date, datetime
 from uuid import UUID
 
@@ -17,11 +17,17 @@ class AttendanceCreate(AttendanceBase):
     classroom_id: UUID
     term_id: UUID
 
+class AttendanceRow(BaseModel):
+    """One student's entry in a bulk attendance submission."""
+    student_id: UUID
+    status: Literal["present", "absent", "late", "excused"]
+    remarks: Optional[str] = None
+
 class AttendanceBulkCreate(BaseModel):
     classroom_id: UUID
     term_id: UUID
     date: date
-    attendance_data: List[dict] # List of {student_id, status, remarks}
+    attendance_data: List[AttendanceRow]
 
 class AttendanceResponse(AttendanceBase):
     id: UUID
@@ -69,9 +75,15 @@ class GradeCreate(GradeBase):
     student_id: UUID
     assessment_id: UUID
 
+class GradeRow(BaseModel):
+    """One student's entry in a bulk grade submission."""
+    student_id: UUID
+    marks_obtained: float
+    remarks: Optional[str] = None
+
 class GradeBulkCreate(BaseModel):
     assessment_id: UUID
-    grades: List[dict] # List of {student_id, marks_obtained, remarks}
+    grades: List[GradeRow]
 
 class GradeResponse(GradeBase):
     id: UUID
@@ -80,3 +92,35 @@ class GradeResponse(GradeBase):
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
+
+# ==========================================
+# Gradebook Schemas
+# ==========================================
+
+class GradebookSubject(BaseModel):
+    id: UUID
+    name: str
+    code: str
+
+class GradebookAssessment(BaseModel):
+    id: UUID
+    subject_id: UUID
+    title: str
+    total_marks: float
+    weight: float
+
+class GradebookStudentRow(BaseModel):
+    student_id: UUID
+    admission_number: str
+    marks: List[Optional[float]] # Aligned with `assessments`, None = not graded
+    subject_percentages: List[float] # Aligned with `subjects`
+    overall_average: float
+    status: str # passed, failed
+    position: int # 1 = top of class, ties share a position
+
+class GradebookResponse(BaseModel):
+    classroom_id: UUID
+    term_id: UUID
+    subjects: List[GradebookSubject]
+    assessments: List[GradebookAssessment]
+    students: List[GradebookStudentRow]
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional, Union
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
+from typing import Literal, Optional, Union
 from datetime import datetime
 from uuid import UUID
 
@@ -43,14 +43,24 @@ class UserUpdate(BaseModel):
     first_name: Optional[str] = Field(None, min_length=1, max_length=100)
     last_name: Optional[str] = Field(None, min_length=1, max_length=100)
     phone: Optional[str] = Field(None, max_length=20)
+    role: Optional[Literal["school_admin", "teacher", "bursar", "accountant"]] = None
     is_active: Optional[bool] = None
     
+    @field_validator("first_name", "last_name", "role", "is_active")
+    @classmethod
+    def not_null(cls, value):
+        """Omit a field to leave it unchanged; these columns can't be cleared."""
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
+    
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "first_name": "John",
                 "last_name": "Doe",
                 "phone": "+263771234567",
+                "role": "teacher",
                 "is_active": True
             }
         }
@@ -9,6 +9,7 @@ from app.schemas.academic import (
     TermCreate, TermUpdate,
     ClassroomCreate, ClassroomUpdate
 )
+from app.services.response_cache import response_cache
 
 class AcademicService:
     """
@@ -23,6 +24,7 @@ class AcademicService:
         db.add(db_year)
         db.commit()
         db.refresh(db_year)
+        response_cache.invalidate("years", school_id)
         return db_year
 
     @staticmethod
@@ -46,6 +48,7 @@ class AcademicService:
         db.add(db_term)
         db.commit()
         db.refresh(db_term)
+        response_cache.invalidate("terms", year.school_id)
         return db_term
 
     @staticmethod
@@ -60,6 +63,7 @@ class AcademicService:
         db.add(db_classroom)
         db.commit()
         db.refresh(db_classroom)
+        response_cache.invalidate("classrooms", school_id)
         return db_classroom
 
     @staticmethod
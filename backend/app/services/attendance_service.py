@@ -1,9 +1,14 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
 from fastapi import HTTPException, status
-from typing import List, Optional
-from datetime import date
+from typing import List, Optional, Dict
+from datetime import date, datetime
 from uuid import UUID
+import uuid
 
+from app.db.rows import RowReader
+from app.db.upsert import upsert_insert
 from app.models.performance import Attendance
 from app.schemas.performance import AttendanceCreate, AttendanceBulkCreate
 
@@ -35,38 +40,84 @@ class AttendanceService:
 
     @staticmethod
     def bulk_mark_attendance(db: Session, school_id: UUID, data: AttendanceBulkCreate) -> List[Attendance]:
-        results = []
+        """
+        Mark attendance for a whole roll in one transaction.
+        Uses a single multi-row INSERT ... ON CONFLICT (student_id, date) DO UPDATE
+        instead of a SELECT/commit/refresh per student.
+        """
+        # Last entry wins if a student appears twice (ON CONFLICT can't touch a row twice)
+        rows = {}
+        now = datetime.utcnow()
         for entry in data.attendance_data:
-            # Reusing the single mark logic
-            att_data = AttendanceCreate(
-                student_id=entry["student_id"],
-                classroom_id=data.classroom_id,
-                term_id=data.term_id,
-                date=data.date,
-                status=entry["status"],
-                remarks=entry.get("remarks")
-            )
-            res = AttendanceService.mark_attendance(db, school_id, att_data)
-            results.append(res)
+            rows[entry.student_id] = {
+                "id": uuid.uuid4(),
+                "school_id": school_id,
+                "student_id": entry.student_id,
+                "classroom_id": data.classroom_id,
+                "term_id": data.term_id,
+                "date": data.date,
+                "status": entry.status,
+                "remarks": entry.remarks,
+                "created_at": now,
+                "updated_at": now,
+            }
+        
+        if not rows:
+            return []
+        
+        stmt = upsert_insert(db, Attendance).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Attendance.student_id, Attendance.date],
+            set_={
+                "status": stmt.excluded.status,
+                "remarks": stmt.excluded.remarks,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        ).returning(Attendance)
+        
+        results = db.scalars(stmt, execution_options={"populate_existing": True}).all()
+        
+        # Detach before commit so the RETURNING values aren't expired and re-fetched row by row
+        for record in results:
+            db.expunge(record)
+        db.commit()
         return results
 
     @staticmethod
-    def get_classroom_attendance(db: Session, classroom_id: UUID, date: date) -> List[Attendance]:
-        return db.query(Attendance).filter(
+    async def get_classroom_attendance(db: AsyncSession, reader: RowReader, classroom_id: UUID, date: date) -> list:
+        return (await db.execute(reader.select().where(
             Attendance.classroom_id == classroom_id,
             Attendance.date == date
-        ).all()
+        ))).all()
 
     @staticmethod
     def get_student_attendance_summary(db: Session, student_id: UUID, term_id: UUID):
-        records = db.query(Attendance).filter(
-            Attendance.student_id == student_id,
+        return AttendanceService.get_attendance_summaries(db, [student_id], term_id)[student_id]
+
+    @staticmethod
+    def get_attendance_summaries(db: Session, student_ids: List[UUID], term_id: UUID) -> Dict[UUID, dict]:
+        """
+        Attendance summaries for many students in one grouped query.
+        Every requested student is in the result (zeros if no records).
+        """
+        counts = {student_id: {} for student_id in student_ids}
+        rows = db.query(Attendance.student_id, Attendance.status, func.count(Attendance.id)).filter(
+            Attendance.student_id.in_(student_ids),
             Attendance.term_id == term_id
-        ).all()
+        ).group_by(Attendance.student_id, Attendance.status)
+        for student_id, record_status, count in rows:
+            counts[student_id][record_status] = count
         
-        total = len(records)
-        present = len([r for r in records if r.status == "present"])
-        late = len([r for r in records if r.status == "late"])
+        return {
+            student_id: AttendanceService._summarize(by_status)
+            for student_id, by_status in counts.items()
+        }
+
+    @staticmethod
+    def _summarize(by_status: Dict[str, int]) -> dict:
+        total = sum(by_status.values())
+        present = by_status.get("present", 0)
+        late = by_status.get("late", 0)
         absent = total - present - late
         
         percentage = (present + (late * 0.5)) / total * 100 if total > 0 else 0
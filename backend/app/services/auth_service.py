@@ -1,21 +1,29 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 from datetime import datetime
 import uuid
 
 from app.models.user import User
-from app.schemas.user import UserCreate, UserLogin
-from app.utils.security import verify_password, get_password_hash, create_access_token
+from app.schemas.user import UserCreate, UserLogin, UserUpdate
+from app.services.identity_cache import identity_cache
+from app.utils.security import (
+    get_password_hash_async, verify_and_update_password_async, create_access_token
+)
 
 class AuthService:
     """
     Authentication service - handles all auth-related business logic.
     Separating this from API routes makes code cleaner and more testable.
+    
+    Login and registration are async: bcrypt runs in the hashing process pool
+    and the (blocking) DB calls in the threadpool, so the event loop stays free.
     """
     
     @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> User:
+    async def create_user(db: Session, user_data: UserCreate) -> User:
         """
         Create a new user.
         
@@ -30,7 +38,7 @@ class AuthService:
             HTTPException: If email already exists
         """
         # Check if email already exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
+        existing_user = await run_in_threadpool(AuthService.get_user_by_email, db, user_data.email)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -45,7 +53,7 @@ class AuthService:
             )
         
         # Create new user with hashed password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         db_user = User(
             email=user_data.email,
@@ -57,16 +65,13 @@ class AuthService:
             school_id=user_data.school_id,
         )
         
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        
-        return db_user
+        return await run_in_threadpool(AuthService._save_user, db, db_user)
     
     @staticmethod
-    def authenticate_user(db: Session, login_data: UserLogin) -> Optional[User]:
+    async def authenticate_user(db: Session, login_data: UserLogin) -> Optional[User]:
         """
         Authenticate a user with email and password.
+        Hashes made with an outdated bcrypt cost are upgraded transparently.
         
         Args:
             db: Database session
@@ -75,23 +80,36 @@ class AuthService:
         Returns:
             User object if authentication successful, None otherwise
         """
-        user = db.query(User).filter(User.email == login_data.email).first()
+        user = await run_in_threadpool(AuthService.get_user_by_email, db, login_data.email)
         
         if not user:
             return None
         
-        if not verify_password(login_data.password, user.password_hash):
+        matches, new_hash = await verify_and_update_password_async(login_data.password, user.password_hash)
+        if not matches:
             return None
         
         if not user.is_active:
             return None
         
+        # Rehash with the current cost while we have the plain password
+        if new_hash:
+            user.password_hash = new_hash
+        
         # Update last login
         user.last_login = datetime.utcnow()
-        db.commit()
+        await run_in_threadpool(AuthService._save_user, db, user)
+        identity_cache.invalidate_user(user.id)
         
         return user
     
+    @staticmethod
+    def _save_user(db: Session, user: User) -> User:
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+    
     @staticmethod
     def create_token_for_user(user: User) -> str:
         """
@@ -113,16 +131,49 @@ class AuthService:
         return access_token
     
     @staticmethod
-    def get_user_by_id(db: Session, user_id: str) -> Optional[User]:
+    def update_user(db: Session, current_user, user_id: uuid.UUID, user_data: UserUpdate) -> User:
+        """
+        Update a user's details, role or active status.
+        
+        Args:
+            db: Database session
+            current_user: User making the change
+            user_id: User to update
+            user_data: Fields to change
+        
+        Returns:
+            Updated user object
+        
+        Raises:
+            HTTPException: If the user is not in the caller's school or tries to change their own role or status
+        """
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user or (current_user.role != "super_admin" and user.school_id != current_user.school_id):
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        if user.id == current_user.id and (user_data.is_active is False or user_data.role not in (None, user.role)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You cannot deactivate yourself or change your own role"
+            )
+        
+        for field, value in user_data.model_dump(exclude_unset=True).items():
+            setattr(user, field, value)
+        
+        db.commit()
+        db.refresh(user)
+        
+        # Deactivation or a role change must take effect on the next request
+        identity_cache.invalidate_user(user.id)
+        
+        return user
+    
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
         """
         Get user by ID.
         """
-        if isinstance(user_id, str):
-            try:
-                user_id = uuid.UUID(user_id)
-            except ValueError:
-                pass
-        return db.query(User).filter(User.id == user_id).first()
+        return await db.get(User, user_id)
     
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -0,0 +1,139 @@
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from typing import Callable, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+from app.config import get_settings
+from app.utils.metrics import CACHE_LOOKUPS, PDF_RENDER_DURATION
+
+settings = get_settings()
+
+# Bump when a PDF template changes so old renders are no longer served
+DOCUMENT_CACHE_VERSION = 1
+
+class DocumentCache:
+    """
+    Content-addressed cache for rendered PDFs on local disk.
+    
+    Documents are keyed by a hash of the exact data that goes into them
+    (the rows behind a report card or receipt), so any change to that data
+    produces a new key and a fresh render. Old renders are never served
+    again and age out through size-bounded LRU eviction.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # Bytes on disk, scanned on first write
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(kind: str, data: dict) -> str:
+        payload = json.dumps(
+            {"kind": kind, "version": DOCUMENT_CACHE_VERSION, "data": data},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def get_or_render(self, key: str, render: Callable[[], bytes], kind: str = "document") -> str:
+        """
+        Return the path of the cached document, rendering it on a miss.
+        """
+        path = os.path.join(self.directory, f"{key}.pdf")
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+            self.hits += 1
+            CACHE_LOOKUPS.labels("document", "hit").inc()
+            return path
+        except FileNotFoundError:
+            self.misses += 1
+            CACHE_LOOKUPS.labels("document", "miss").inc()
+        
+        start = time.perf_counter()
+        content = render()
+        PDF_RENDER_DURATION.labels(kind).observe(time.perf_counter() - start)
+        
+        self._store(path, content)
+        return path
+    
+    def pdf_response(self, request: Request, kind: str, data: dict, render: Callable[[dict], bytes], filename: str) -> Response:
+        """
+        Serve a PDF with an ETag: 304 if the client already has this version,
+        otherwise the cached file (rendered first if needed).
+        """
+        key = self.make_key(kind, data)
+        headers = {
+            "ETag": f'"{key}"',
+            # Always revalidate, so changed grades or payments show up immediately
+            "Cache-Control": "private, no-cache",
+        }
+        
+        if etag_matches(request.headers.get("if-none-match"), key):
+            return Response(status_code=304, headers=headers)
+        
+        path = self.get_or_render(key, lambda: render(data), kind)
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+        return FileResponse(path, media_type="application/pdf", headers=headers)
+    
+    def _store(self, path: str, content: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        
+        # Write then rename, so readers never see a half-written file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, _, size in self._scan())
+            self._size += len(content)
+            if self._size > self.max_bytes:
+                self._evict()
+    
+    def _scan(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pdf"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+    
+    def _evict(self):
+        """
+        Delete least recently used documents until we're 10% under the limit.
+        Rescans the directory, so files written by other workers are counted too.
+        """
+        entries = sorted(self._scan())
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * 0.9
+        
+        for _, path, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        
+        self._size = total
+
+def etag_matches(if_none_match: Optional[str], key: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/").strip('"') == key for tag in tags)
+
+document_cache = DocumentCache(settings.DOCUMENT_CACHE_DIR, settings.DOCUMENT_CACHE_MAX_MB * 1024 * 1024)
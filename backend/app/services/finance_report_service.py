@@ -2,6 +2,7 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from fastapi import HTTPException
 from io import BytesIO
 from sqlalchemy.orm import Session
 from uuid import UUID
@@ -10,6 +11,7 @@ from datetime import datetime
 from app.models.student import Student
 from app.models.finance import Payment, FeeStructure
 from app.services.finance_service import FinanceService
+from app.services.document_cache import document_cache
 
 class FinanceReportService:
     """
@@ -18,9 +20,33 @@ class FinanceReportService:
     
     @staticmethod
     def generate_payment_receipt(db: Session, payment_id: UUID) -> BytesIO:
+        data = FinanceReportService.get_receipt_data(db, payment_id)
+        key = document_cache.make_key("payment_receipt", data)
+        path = document_cache.get_or_render(key, lambda: FinanceReportService.render_payment_receipt(data), "payment_receipt")
+        with open(path, "rb") as f:
+            return BytesIO(f.read())
+    
+    @staticmethod
+    def get_receipt_data(db: Session, payment_id: UUID) -> dict:
+        """
+        Everything a receipt shows, as plain data (also the cache key input).
+        """
         payment = db.query(Payment).filter(Payment.id == payment_id).first()
+        if not payment:
+            raise HTTPException(status_code=404, detail="Payment not found")
         student = db.query(Student).filter(Student.id == payment.student_id).first()
         
+        return {
+            "receipt_id": str(payment.id),
+            "date": payment.date.strftime("%Y-%m-%d %H:%M"),
+            "admission_number": student.admission_number,
+            "payment_method": payment.payment_method,
+            "reference_number": payment.reference_number or "N/A",
+            "amount_paid": f"${payment.amount_paid:,.2f}",
+        }
+    
+    @staticmethod
+    def render_payment_receipt(data: dict) -> bytes:
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
         elements = []
@@ -30,16 +56,16 @@ class FinanceReportService:
         elements.append(Paragraph("OFFICIAL PAYMENT RECEIPT", styles['Title']))
         elements.append(Spacer(1, 24))
         
-        data = [
-            ["Receipt ID:", str(payment.id)],
-            ["Date:", payment.date.strftime("%Y-%m-%d %H:%M")],
-            ["Student Admission:", student.admission_number],
-            ["Payment Method:", payment.payment_method],
-            ["Reference Number:", payment.reference_number or "N/A"],
-            ["Amount Paid:", f"${payment.amount_paid:,.2f}"],
+        rows = [
+            ["Receipt ID:", data["receipt_id"]],
+            ["Date:", data["date"]],
+            ["Student Admission:", data["admission_number"]],
+            ["Payment Method:", data["payment_method"]],
+            ["Reference Number:", data["reference_number"]],
+            ["Amount Paid:", data["amount_paid"]],
         ]
         
-        t = Table(data, colWidths=[150, 300])
+        t = Table(rows, colWidths=[150, 300])
         t.setStyle(TableStyle([
             ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -52,5 +78,4 @@ class FinanceReportService:
         elements.append(Paragraph("Thank you for your payment.", styles['Italic']))
         
         doc.build(elements)
-        buffer.seek(0)
-        return buffer
+        return buffer.getvalue()
@@ -1,12 +1,19 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import List, Optional, Dict
 from uuid import UUID
-from sqlalchemy import func
+from datetime import date, datetime
+from sqlalchemy import func, select, case, and_
+import uuid
 
-from app.models.finance import FeeStructure, Payment
+from app.db.pagination import KeysetPage, Page
+from app.db.rows import RowReader
+from app.db.upsert import upsert_insert, chunked
+from app.models.finance import FeeStructure, Payment, StudentTermBalance
 from app.models.student import Student, Enrollment
 from app.schemas.finance import FeeStructureCreate, PaymentCreate
+from app.services.response_cache import response_cache
 
 class FinanceService:
     """
@@ -26,14 +33,18 @@ class FinanceService:
         if existing:
             existing.total_amount = data.total_amount
             existing.description = data.description
+            FinanceService._set_ledger_fees(db, school_id, data.classroom_id, data.term_id, data.total_amount)
             db.commit()
             db.refresh(existing)
+            response_cache.invalidate("fee_structures", school_id)
             return existing
             
         db_structure = FeeStructure(**data.model_dump(), school_id=school_id)
         db.add(db_structure)
+        FinanceService._set_ledger_fees(db, school_id, data.classroom_id, data.term_id, data.total_amount)
         db.commit()
         db.refresh(db_structure)
+        response_cache.invalidate("fee_structures", school_id)
         return db_structure
 
     @staticmethod
@@ -56,37 +67,46 @@ class FinanceService:
             recorded_by_id=recorder_id
         )
         db.add(db_payment)
+        
+        # 3. Update the running balance in the same transaction
+        FinanceService.update_ledger(db, school_id, data.student_id, data.term_id, paid_delta=data.amount_paid)
         db.commit()
         db.refresh(db_payment)
         return db_payment
 
     @staticmethod
-    def get_student_payments(db: Session, student_id: UUID, term_id: Optional[UUID] = None) -> List[Payment]:
-        query = db.query(Payment).filter(Payment.student_id == student_id)
+    def get_student_payments(db: Session, student_id: UUID, page: KeysetPage, term_id: Optional[UUID] = None) -> Page:
+        query = page.select().where(Payment.student_id == student_id)
         if term_id:
-            query = query.filter(Payment.term_id == term_id)
-        return query.all()
+            query = query.where(Payment.term_id == term_id)
+        return page.fetch(db, query)
 
     @staticmethod
-    def get_all_payments(db: Session, school_id: UUID, limit: int = 50) -> List[Payment]:
-        return db.query(Payment).filter(Payment.school_id == school_id).order_by(Payment.payment_date.desc()).limit(limit).all()
+    def get_all_payments(db: Session, reader: RowReader, school_id: UUID, limit: int = 50) -> list:
+        return db.execute(
+            reader.select().where(Payment.school_id == school_id).order_by(Payment.date.desc()).limit(limit)
+        ).all()
 
     @staticmethod
     def get_revenue_stats(db: Session, school_id: UUID):
-        # Total revenue collected
-        total_revenue = db.query(func.sum(Payment.amount_paid)).filter(Payment.school_id == school_id).scalar() or 0
+        # Total revenue collected and still outstanding, from the balance ledger
+        outstanding = StudentTermBalance.total_fees - StudentTermBalance.total_paid
+        total_revenue, outstanding_fees = db.query(
+            func.sum(StudentTermBalance.total_paid),
+            func.sum(case((outstanding > 0, outstanding), else_=0))
+        ).filter(StudentTermBalance.school_id == school_id).one()
         
         # This month's revenue
-        from datetime import date
         today = date.today()
         month_start = date(today.year, today.month, 1)
         monthly_revenue = db.query(func.sum(Payment.amount_paid)).filter(
             Payment.school_id == school_id,
-            Payment.payment_date >= month_start
+            Payment.date >= month_start
         ).scalar() or 0
         
         return {
-            "total_revenue": total_revenue,
+            "total_revenue": total_revenue or 0,
+            "outstanding_fees": outstanding_fees or 0,
             "monthly_revenue": monthly_revenue,
             # We could add more complex trends here later
         }
@@ -94,38 +114,18 @@ class FinanceService:
     # --- Balance Calculations ---
 
     @staticmethod
-    def get_student_fee_balance(db: Session, student_id: UUID, term_id: UUID):
-        # 1. Find the student's classroom for this term
-        enrollment = db.query(Enrollment).filter(
-            Enrollment.student_id == student_id,
-            Enrollment.term_id == term_id
-        ).first()
-        
-        if not enrollment:
-            return {
-                "total_fees": 0,
-                "total_paid": 0,
-                "balance": 0,
-                "status": "pending"
-            }
-            
-        # 2. Get the fee structure for that classroom and term
-        fee_structure = db.query(FeeStructure).filter(
-            FeeStructure.classroom_id == enrollment.classroom_id,
-            FeeStructure.term_id == term_id
-        ).first()
-        
-        total_fees = fee_structure.total_amount if fee_structure else 0
-        
-        # 3. Sum all payments made by this student for this term
-        total_paid = db.query(func.sum(Payment.amount_paid)).filter(
-            Payment.student_id == student_id,
-            Payment.term_id == term_id
-        ).scalar() or 0
+    async def get_student_fee_balance(db: AsyncSession, student_id: UUID, term_id: UUID):
+        # Single-row read from the ledger maintained by payments and fee setup
+        ledger = (await db.execute(select(StudentTermBalance).where(
+            StudentTermBalance.student_id == student_id,
+            StudentTermBalance.term_id == term_id
+        ))).scalars().first()
         
+        total_fees = ledger.total_fees if ledger else 0
+        total_paid = ledger.total_paid if ledger else 0
         balance = total_fees - total_paid
         
-        status = "paid" if balance <= 0 and total_fees > 0 else "partial" if total_paid > 0 else "pending"
+        balance_status = "paid" if balance <= 0 and total_fees > 0 else "partial" if total_paid > 0 else "pending"
         
         return {
             "student_id": student_id,
@@ -133,5 +133,228 @@ class FinanceService:
             "total_fees": total_fees,
             "total_paid": total_paid,
             "balance": max(0, balance),
-            "status": status
+            "status": balance_status
+        }
+
+    @staticmethod
+    async def get_classroom_fee_balances(
+        db: AsyncSession,
+        classroom_id: UUID,
+        term_id: UUID,
+        status_filter: Optional[str] = None,
+        sort: str = "balance_desc"
+    ) -> List[dict]:
+        """
+        Fee balances for every student enrolled in a classroom for a term.
+        
+        One query: enrollments joined to the balance ledger. Status
+        filtering and sorting by outstanding amount happen in SQL too.
+        """
+        total_fees = func.coalesce(StudentTermBalance.total_fees, 0)
+        total_paid = func.coalesce(StudentTermBalance.total_paid, 0)
+        outstanding = total_fees - total_paid
+        
+        # Same rules as get_student_fee_balance
+        balance = case((outstanding > 0, outstanding), else_=0)
+        balance_status = case(
+            (and_(outstanding <= 0, total_fees > 0), "paid"),
+            (total_paid > 0, "partial"),
+            else_="pending"
+        )
+        
+        query = select(
+            Enrollment.student_id,
+            Enrollment.term_id,
+            Student.admission_number,
+            total_fees.label("total_fees"),
+            total_paid.label("total_paid"),
+            balance.label("balance"),
+            balance_status.label("status")
+        ).join(Student, Student.id == Enrollment.student_id).outerjoin(
+            StudentTermBalance,
+            and_(StudentTermBalance.student_id == Enrollment.student_id, StudentTermBalance.term_id == Enrollment.term_id)
+        ).where(
+            Enrollment.classroom_id == classroom_id,
+            Enrollment.term_id == term_id
+        )
+        
+        if status_filter:
+            query = query.where(balance_status == status_filter)
+        
+        order = balance.asc() if sort == "balance_asc" else balance.desc()
+        query = query.order_by(order, Student.admission_number)
+        
+        return [dict(row._mapping) for row in await db.execute(query)]
+
+    # --- Balance Ledger ---
+
+    @staticmethod
+    def update_ledger(db: Session, school_id, student_id: UUID, term_id: UUID, paid_delta: float = 0, refresh_fees: bool = False):
+        """
+        Upsert a student's ledger row without committing.
+        
+        Adds `paid_delta` to total_paid atomically in SQL. New rows (and
+        existing ones when `refresh_fees` is set) take total_fees from the
+        fee structure of the student's classroom for the term.
+        """
+        fees = select(func.coalesce(func.max(FeeStructure.total_amount), 0)).join(
+            Enrollment,
+            and_(Enrollment.classroom_id == FeeStructure.classroom_id, Enrollment.term_id == FeeStructure.term_id)
+        ).where(
+            Enrollment.student_id == student_id,
+            Enrollment.term_id == term_id
+        ).scalar_subquery()
+        
+        stmt = upsert_insert(db, StudentTermBalance).values(
+            id=uuid.uuid4(),
+            school_id=school_id,
+            student_id=student_id,
+            term_id=term_id,
+            total_fees=fees,
+            total_paid=paid_delta,
+            updated_at=datetime.utcnow()
+        )
+        set_ = {
+            "total_paid": StudentTermBalance.total_paid + stmt.excluded.total_paid,
+            "updated_at": stmt.excluded.updated_at,
         }
+        if refresh_fees:
+            set_["total_fees"] = stmt.excluded.total_fees
+        
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[StudentTermBalance.student_id, StudentTermBalance.term_id],
+            set_=set_
+        ))
+
+    @staticmethod
+    def add_payments_to_ledger(db: Session, school_id: UUID, term_id: UUID, paid_by_student: Dict[UUID, float]):
+        """
+        Bulk version of update_ledger for many payments in one term, without committing.
+        One query for the students' fees, then one multi-row upsert per chunk.
+        """
+        now = datetime.utcnow()
+        for chunk in chunked(list(paid_by_student.items())):
+            student_ids = [student_id for student_id, _ in chunk]
+            fees = dict(db.query(Enrollment.student_id, func.max(FeeStructure.total_amount)).join(
+                FeeStructure,
+                and_(FeeStructure.classroom_id == Enrollment.classroom_id, FeeStructure.term_id == Enrollment.term_id)
+            ).filter(
+                Enrollment.student_id.in_(student_ids),
+                Enrollment.term_id == term_id
+            ).group_by(Enrollment.student_id).all())
+            
+            stmt = upsert_insert(db, StudentTermBalance).values([
+                {
+                    "id": uuid.uuid4(),
+                    "school_id": school_id,
+                    "student_id": student_id,
+                    "term_id": term_id,
+                    "total_fees": fees.get(student_id) or 0.0,
+                    "total_paid": amount,
+                    "updated_at": now,
+                }
+                for student_id, amount in chunk
+            ])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[StudentTermBalance.student_id, StudentTermBalance.term_id],
+                set_={
+                    "total_paid": StudentTermBalance.total_paid + stmt.excluded.total_paid,
+                    "updated_at": stmt.excluded.updated_at,
+                }
+            ))
+
+    @staticmethod
+    def _set_ledger_fees(db: Session, school_id: UUID, classroom_id: UUID, term_id: UUID, total_fees: float):
+        """
+        Apply a (new) fee amount to the ledger of every student enrolled in the classroom.
+        """
+        student_ids = db.scalars(select(Enrollment.student_id).where(
+            Enrollment.classroom_id == classroom_id,
+            Enrollment.term_id == term_id
+        )).all()
+        
+        now = datetime.utcnow()
+        for chunk in chunked(student_ids):
+            stmt = upsert_insert(db, StudentTermBalance).values([
+                {
+                    "id": uuid.uuid4(),
+                    "school_id": school_id,
+                    "student_id": student_id,
+                    "term_id": term_id,
+                    "total_fees": total_fees,
+                    "total_paid": 0.0,
+                    "updated_at": now,
+                }
+                for student_id in chunk
+            ])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[StudentTermBalance.student_id, StudentTermBalance.term_id],
+                set_={"total_fees": stmt.excluded.total_fees, "updated_at": stmt.excluded.updated_at}
+            ))
+
+    @staticmethod
+    def reconcile_fee_ledger(db: Session, apply: bool = True) -> List[dict]:
+        """
+        Rebuild the balance ledger from enrollments, fee structures and payments.
+        
+        Returns one entry per (student, term) whose ledger row differed from
+        history. With apply=False nothing is written (drift report only).
+        """
+        expected = {}
+        
+        fee_rows = db.query(
+            Enrollment.student_id, Enrollment.term_id, Student.school_id,
+            func.coalesce(func.max(FeeStructure.total_amount), 0)
+        ).join(Student, Student.id == Enrollment.student_id).outerjoin(
+            FeeStructure,
+            and_(FeeStructure.classroom_id == Enrollment.classroom_id, FeeStructure.term_id == Enrollment.term_id)
+        ).group_by(Enrollment.student_id, Enrollment.term_id, Student.school_id)
+        for student_id, term_id, school_id, total_fees in fee_rows:
+            expected[(student_id, term_id)] = {"school_id": school_id, "total_fees": total_fees, "total_paid": 0.0}
+        
+        paid_rows = db.query(
+            Payment.student_id, Payment.term_id, Payment.school_id, func.sum(Payment.amount_paid)
+        ).group_by(Payment.student_id, Payment.term_id, Payment.school_id)
+        for student_id, term_id, school_id, total_paid in paid_rows:
+            row = expected.setdefault((student_id, term_id), {"school_id": school_id, "total_fees": 0.0, "total_paid": 0.0})
+            row["total_paid"] += total_paid
+        
+        drift = []
+        ledger = {(row.student_id, row.term_id): row for row in db.query(StudentTermBalance)}
+        for key in expected.keys() | ledger.keys():
+            want = expected.get(key, {"total_fees": 0.0, "total_paid": 0.0})
+            have = ledger.get(key)
+            have_fees = have.total_fees if have else 0.0
+            have_paid = have.total_paid if have else 0.0
+            if have is None or abs(have_fees - want["total_fees"]) > 0.005 or abs(have_paid - want["total_paid"]) > 0.005:
+                drift.append({
+                    "student_id": key[0],
+                    "term_id": key[1],
+                    "ledger_fees": have_fees if have else None,
+                    "expected_fees": want["total_fees"],
+                    "ledger_paid": have_paid if have else None,
+                    "expected_paid": want["total_paid"],
+                })
+        
+        if apply and drift:
+            now = datetime.utcnow()
+            for entry in drift:
+                key = (entry["student_id"], entry["term_id"])
+                if key not in expected:
+                    db.delete(ledger[key])
+                elif key in ledger:
+                    ledger[key].total_fees = expected[key]["total_fees"]
+                    ledger[key].total_paid = expected[key]["total_paid"]
+                    ledger[key].updated_at = now
+                else:
+                    db.add(StudentTermBalance(
+                        school_id=expected[key]["school_id"],
+                        student_id=key[0],
+                        term_id=key[1],
+                        total_fees=expected[key]["total_fees"],
+                        total_paid=expected[key]["total_paid"],
+                        updated_at=now
+                    ))
+            db.commit()
+        
+        return drift
@@ -1,17 +1,24 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import List, Optional, Dict
 from uuid import UUID
-from sqlalchemy import func
+from datetime import datetime
+from sqlalchemy import func, select
+import uuid
 
+from app.db.upsert import upsert_insert, chunked
 from app.models.performance import Assessment, Grade
-from app.schemas.performance import AssessmentCreate, GradeCreate, GradeBulkCreate
+from app.models.student import Student
+from app.schemas.performance import AssessmentCreate, GradeCreate, GradeBulkCreate, GradeRow
 
 class GradeService:
     """
     Service for managing assessments and grades.
     """
     
+    # Minimum weighted percentage for a subject to count as passed
+    PASS_MARK = 50
+    
     @staticmethod
     def create_assessment(db: Session, school_id: UUID, data: AssessmentCreate) -> Assessment:
         db_assessment = Assessment(**data.model_dump(), school_id=school_id)
@@ -43,48 +50,148 @@ class GradeService:
 
     @staticmethod
     def bulk_enter_grades(db: Session, data: GradeBulkCreate) -> List[Grade]:
-        results = []
-        for entry in data.grades:
-            grade_data = GradeCreate(
-                student_id=entry["student_id"],
-                assessment_id=data.assessment_id,
-                marks_obtained=entry["marks_obtained"],
-                remarks=entry.get("remarks")
+        """
+        Enter grades for a whole assessment in one transaction.
+        
+        The full payload is validated before anything is written, then
+        grades are upserted with multi-row INSERT ... ON CONFLICT
+        (student_id, assessment_id) statements and committed once.
+        """
+        assessment = db.query(Assessment).filter(Assessment.id == data.assessment_id).first()
+        if not assessment:
+            raise HTTPException(status_code=404, detail="Assessment not found")
+        
+        rows, errors = GradeService._validate_bulk_grades(assessment, data.grades)
+        
+        # Every referenced student must exist (one IN query per chunk)
+        known_students = set()
+        for student_ids in chunked(list(rows.keys())):
+            known_students.update(
+                db.scalars(select(Student.id).where(Student.id.in_(student_ids)))
             )
-            res = GradeService.enter_grade(db, grade_data)
-            results.append(res)
+        for student_id, (index, _, _) in rows.items():
+            if student_id not in known_students:
+                errors.append({"row": index, "error": f"Student {student_id} not found"})
+        
+        if errors:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=sorted(errors, key=lambda e: e["row"])
+            )
+        
+        results = []
+        now = datetime.utcnow()
+        for chunk in chunked(rows.items()):
+            stmt = upsert_insert(db, Grade).values([
+                {
+                    "id": uuid.uuid4(),
+                    "student_id": student_id,
+                    "assessment_id": assessment.id,
+                    "marks_obtained": marks,
+                    "remarks": remarks,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for student_id, (_, marks, remarks) in chunk
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Grade.student_id, Grade.assessment_id],
+                set_={
+                    "marks_obtained": stmt.excluded.marks_obtained,
+                    "remarks": stmt.excluded.remarks,
+                    "updated_at": stmt.excluded.updated_at,
+                }
+            ).returning(Grade)
+            results.extend(db.scalars(stmt, execution_options={"populate_existing": True}))
+        
+        # Detach before commit so the RETURNING values aren't expired and re-fetched row by row
+        for grade in results:
+            db.expunge(grade)
+        db.commit()
         return results
 
     @staticmethod
-    def calculate_student_subject_grade(db: Session, student_id: UUID, subject_id: UUID, term_id: UUID):
+    def _validate_bulk_grades(assessment: Assessment, entries: List[GradeRow]):
         """
-        Logic to compute weighted averages for a subject in a term.
+        Check bulk grade entries against the assessment in a single pass.
+        (Types were already validated with the request body.)
+        
+        Returns:
+            ({student_id: (row_index, marks, remarks)}, [errors])
+            Later rows for the same student replace earlier ones.
         """
-        # Get all assessments for this subject in this term
-        assessments = db.query(Assessment).filter(
-            Assessment.subject_id == subject_id,
-            Assessment.term_id == term_id
-        ).all()
+        rows = {}
+        errors = []
+        for index, entry in enumerate(entries):
+            if not 0 <= entry.marks_obtained <= assessment.total_marks:
+                errors.append({"row": index, "error": f"marks_obtained must be between 0 and {assessment.total_marks}"})
+                continue
+            
+            rows[entry.student_id] = (index, entry.marks_obtained, entry.remarks)
+        return rows, errors
+
+    @staticmethod
+    def calculate_student_term_grades(
+        db: Session, student_id: UUID, term_id: UUID, subject_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, dict]:
+        """
+        Compute weighted averages for every subject a student was graded in for a term.
+        
+        When `subject_ids` is given, every requested subject is in the result
+        (0% if ungraded); otherwise only subjects with grades are returned.
+        """
+        return GradeService.calculate_term_grades(db, [student_id], term_id, subject_ids)[student_id]
+
+    @staticmethod
+    def calculate_term_grades(
+        db: Session, student_ids: List[UUID], term_id: UUID, subject_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, Dict[UUID, dict]]:
+        """
+        Weighted subject averages for many students in one aggregated query.
         
-        total_weighted_score = 0
-        total_weight = 0
+        Grades are joined to assessments and the weighted percentages and
+        weights are summed per (student, subject). Returns
+        {student_id: {subject_id: result}} with every requested student present.
+        """
+        weighted_percentage = (Grade.marks_obtained / Assessment.total_marks) * 100 * (Assessment.weight / 100)
         
-        for assessment in assessments:
-            # Get student's grade for this assessment
-            grade = db.query(Grade).filter(
-                Grade.student_id == student_id,
-                Grade.assessment_id == assessment.id
-            ).first()
-            
-            if grade:
-                percentage = (grade.marks_obtained / assessment.total_marks) * 100
-                total_weighted_score += (percentage * (assessment.weight / 100))
-                total_weight += assessment.weight
+        query = db.query(
+            Grade.student_id,
+            Assessment.subject_id,
+            func.sum(weighted_percentage),
+            func.sum(Assessment.weight)
+        ).join(Grade, Grade.assessment_id == Assessment.id).filter(
+            Grade.student_id.in_(student_ids),
+            Assessment.term_id == term_id
+        )
+        if subject_ids is not None:
+            query = query.filter(Assessment.subject_id.in_(subject_ids))
+        
+        totals = {student_id: {} for student_id in student_ids}
+        for student_id, subject_id, weighted_score, total_weight in query.group_by(Grade.student_id, Assessment.subject_id):
+            totals[student_id][subject_id] = (weighted_score, total_weight)
         
-        final_percentage = (total_weighted_score / total_weight) * 100 if total_weight > 0 else 0
+        return {
+            student_id: {
+                subject_id: GradeService._subject_grade_result(subject_id, *by_subject.get(subject_id, (0, 0)))
+                for subject_id in (subject_ids if subject_ids is not None else by_subject)
+            }
+            for student_id, by_subject in totals.items()
+        }
+
+    @staticmethod
+    def calculate_student_subject_grade(db: Session, student_id: UUID, subject_id: UUID, term_id: UUID):
+        """
+        Logic to compute weighted averages for a subject in a term.
+        """
+        return GradeService.calculate_student_term_grades(db, student_id, term_id, [subject_id])[subject_id]
+
+    @staticmethod
+    def _subject_grade_result(subject_id: UUID, total_weighted_score: float, total_weight: float) -> dict:
+        final_percentage = (total_weighted_score / total_weight) * 100 if total_weight else 0
         
         return {
             "subject_id": subject_id,
             "final_percentage": round(final_percentage, 2),
-            "status": "passed" if final_percentage >= 50 else "failed"
+            "status": "passed" if final_percentage >= GradeService.PASS_MARK else "failed"
         }
@@ -0,0 +1,115 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from app.models.performance import Assessment, Grade
+from app.models.student import Student, Enrollment
+from app.models.subject import Subject
+from app.services.grade_service import GradeService
+
+class GradebookService:
+    """
+    Vectorized end-of-term results for a whole classroom.
+
+    Loads every grade for a classroom and term into a dense
+    students x assessments matrix (NaN = not graded) and computes subject
+    percentages, averages, pass/fail and positions in one pass, using the
+    same weighting rules as GradeService.calculate_student_subject_grade.
+    """
+
+    @staticmethod
+    def build_classroom_gradebook(db: Session, classroom_id: UUID, term_id: UUID) -> dict:
+        # 1. Fetch data (four queries regardless of class size)
+        roster = db.query(Student.id, Student.admission_number).join(Enrollment).filter(
+            Enrollment.classroom_id == classroom_id,
+            Enrollment.term_id == term_id,
+            Enrollment.status == "active"
+        ).order_by(Student.admission_number).all()
+
+        assessments = db.query(
+            Assessment.id, Assessment.subject_id, Assessment.title,
+            Assessment.total_marks, Assessment.weight
+        ).filter(
+            Assessment.classroom_id == classroom_id,
+            Assessment.term_id == term_id
+        ).order_by(Assessment.date, Assessment.title).all()
+
+        subject_ids = {a.subject_id for a in assessments}
+        subjects = db.query(Subject.id, Subject.name, Subject.code).filter(
+            Subject.id.in_(subject_ids)
+        ).order_by(Subject.name).all() if subject_ids else []
+
+        grades = db.query(Grade.student_id, Grade.assessment_id, Grade.marks_obtained).join(Assessment).filter(
+            Assessment.classroom_id == classroom_id,
+            Assessment.term_id == term_id
+        ).all()
+
+        # 2. Dense marks matrix, NaN where a student has no grade
+        student_index = {row.id: i for i, row in enumerate(roster)}
+        assessment_index = {a.id: j for j, a in enumerate(assessments)}
+        subject_index = {s.id: k for k, s in enumerate(subjects)}
+
+        marks = np.full((len(roster), len(assessments)), np.nan)
+        cells = [
+            (student_index[g.student_id], assessment_index[g.assessment_id], g.marks_obtained)
+            for g in grades
+            if g.student_id in student_index  # skip grades of withdrawn students
+        ]
+        if cells:
+            rows, cols, values = zip(*cells)
+            marks[list(rows), list(cols)] = values
+
+        # 3. Weighted subject percentages: sum(pct * weight) / sum(weight) over graded assessments
+        total_marks = np.array([a.total_marks for a in assessments], dtype=float)
+        weights = np.array([a.weight if a.weight is not None else 100.0 for a in assessments], dtype=float)
+
+        # One-hot assessment -> subject map, so per-subject sums become a matrix product
+        subject_map = np.zeros((len(assessments), len(subjects)))
+        subject_map[np.arange(len(assessments)), [subject_index[a.subject_id] for a in assessments]] = 1
+
+        graded = ~np.isnan(marks)
+        weighted_scores = np.where(graded, marks / total_marks * 100 * weights, 0.0) @ subject_map
+        graded_weights = (graded * weights) @ subject_map
+
+        subject_percentages = np.zeros_like(weighted_scores)
+        np.divide(weighted_scores, graded_weights, out=subject_percentages, where=graded_weights > 0)
+        subject_percentages = np.round(subject_percentages, 2)
+
+        # 4. Overall average, pass/fail and competition-style positions (1, 2, 2, 4)
+        if len(subjects):
+            overall = np.round(subject_percentages.mean(axis=1), 2)
+        else:
+            overall = np.zeros(len(roster))
+        passed = overall >= GradeService.PASS_MARK
+        positions = np.searchsorted(np.sort(-overall), -overall, side="left") + 1
+
+        marks_out = marks.astype(object)
+        marks_out[~graded] = None
+
+        return {
+            "classroom_id": classroom_id,
+            "term_id": term_id,
+            "subjects": [{"id": s.id, "name": s.name, "code": s.code} for s in subjects],
+            "assessments": [
+                {
+                    "id": a.id,
+                    "subject_id": a.subject_id,
+                    "title": a.title,
+                    "total_marks": a.total_marks,
+                    "weight": float(weights[j]),
+                }
+                for j, a in enumerate(assessments)
+            ],
+            "students": [
+                {
+                    "student_id": student.id,
+                    "admission_number": student.admission_number,
+                    "marks": marks_out[i].tolist(),
+                    "subject_percentages": subject_percentages[i].tolist(),
+                    "overall_average": float(overall[i]),
+                    "status": "passed" if passed[i] else "failed",
+                    "position": int(positions[i]),
+                }
+                for i, student in enumerate(roster)
+            ],
+        }
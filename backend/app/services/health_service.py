@@ -0,0 +1,84 @@
+from sqlalchemy import func, select
+from sqlalchemy.pool import Pool
+from datetime import datetime
+from typing import Optional, Tuple
+import asyncio
+import time
+
+from app.config import get_settings
+from app.db.database import engine, async_engine
+from app.models.job import Job
+
+settings = get_settings()
+
+class HealthService:
+    """
+    Liveness and readiness checks for load balancers and orchestrators.
+    """
+    
+    @staticmethod
+    async def check_readiness() -> Tuple[bool, dict]:
+        """
+        Can this instance take traffic right now?
+        
+        Not ready if the DB round trip fails or exceeds READINESS_DB_TIMEOUT,
+        or if a connection pool is at READINESS_MAX_POOL_SATURATION or more -
+        better to be drained than to time out user requests. The job backlog
+        is reported but doesn't fail readiness: the queue is shared by all instances.
+        """
+        pools = {
+            "sync": HealthService._pool_saturation(engine.pool),
+            "async": HealthService._pool_saturation(async_engine.sync_engine.pool),
+        }
+        saturated = [
+            name for name, pool in pools.items()
+            if pool and pool["saturation"] >= settings.READINESS_MAX_POOL_SATURATION
+        ]
+        
+        database = {"status": "ok", "latency_ms": None}
+        jobs = None
+        start = time.perf_counter()
+        try:
+            jobs = await asyncio.wait_for(HealthService._probe_database(), settings.READINESS_DB_TIMEOUT)
+            database["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        except asyncio.TimeoutError:
+            database["status"] = "timeout"
+        except Exception as e:
+            database["status"] = "error"
+            database["error"] = type(e).__name__
+        
+        ready = database["status"] == "ok" and not saturated
+        return ready, {
+            "status": "ready" if ready else "not_ready",
+            "database": database,
+            "pools": pools,
+            "saturated_pools": saturated,
+            "jobs": jobs,
+        }
+    
+    @staticmethod
+    async def _probe_database() -> dict:
+        """
+        One round trip that also reads the job backlog (served by ix_jobs_status_created_at).
+        """
+        async with async_engine.connect() as conn:
+            queued, oldest = (await conn.execute(
+                select(func.count(Job.id), func.min(Job.created_at)).where(Job.status == "queued")
+            )).one()
+        return {
+            "queued": queued,
+            "oldest_queued_seconds": round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else None,
+        }
+    
+    @staticmethod
+    def _pool_saturation(pool: Pool) -> Optional[dict]:
+        # Only bounded pools (QueuePool with a max overflow) can saturate
+        if not hasattr(pool, "checkedout") or pool._max_overflow < 0:
+            return None
+        capacity = pool.size() + pool._max_overflow
+        in_use = pool.checkedout()
+        return {
+            "in_use": in_use,
+            "capacity": capacity,
+            "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+        }
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+import threading
+import time
+
+from app.config import get_settings
+from app.models.user import User
+from app.utils.metrics import CACHE_LOOKUPS
+
+settings = get_settings()
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    Read-only copy of the user fields routes need (id, role, school_id...).
+    Detached from any session, so it is safe to share between requests.
+    """
+    id: UUID
+    school_id: Optional[UUID]
+    email: str
+    first_name: str
+    last_name: str
+    phone: Optional[str]
+    role: str
+    is_active: bool
+    last_login: Optional[datetime]
+    created_at: datetime
+    
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            school_id=user.school_id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            phone=user.phone,
+            role=user.role,
+            is_active=bool(user.is_active),
+            last_login=user.last_login,
+            created_at=user.created_at,
+        )
+    
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+class IdentityCache:
+    """
+    In-process cache for authentication.
+    
+    Two bounded LRU maps:
+    - verified token -> user id, kept until the token's own expiry
+    - user id -> UserSnapshot, kept for `ttl` seconds
+    
+    A repeat request with the same token needs no JWT decode and no DB read.
+    Changes made through AuthService invalidate the user immediately in this
+    process; other worker processes pick them up once the TTL runs out.
+    """
+    
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._tokens: "OrderedDict[str, tuple]" = OrderedDict()  # token -> (user_id, expires_at)
+        self._users: "OrderedDict[UUID, tuple]" = OrderedDict()  # user_id -> (snapshot, expires_at)
+        self._lock = threading.Lock()
+    
+    def get_token(self, token: str) -> Optional[UUID]:
+        with self._lock:
+            return self._get(self._tokens, token)
+    
+    def put_token(self, token: str, user_id: UUID, expires_at: float):
+        with self._lock:
+            self._put(self._tokens, token, (user_id, expires_at))
+    
+    def get_user(self, user_id: UUID) -> Optional[UserSnapshot]:
+        with self._lock:
+            snapshot = self._get(self._users, user_id)
+            if snapshot is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        CACHE_LOOKUPS.labels("identity", "miss" if snapshot is None else "hit").inc()
+        return snapshot
+    
+    def put_user(self, user: User) -> UserSnapshot:
+        snapshot = UserSnapshot.from_user(user)
+        if self.ttl > 0:
+            with self._lock:
+                self._put(self._users, snapshot.id, (snapshot, time.time() + self.ttl))
+        return snapshot
+    
+    def invalidate_user(self, user_id: UUID):
+        """
+        Drop a user's snapshot, e.g. after deactivation or a role change.
+        Their tokens stay cached but resolve through a fresh DB read.
+        """
+        with self._lock:
+            self._users.pop(user_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+    
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "cached_tokens": len(self._tokens),
+                "cached_users": len(self._users),
+            }
+    
+    def _get(self, entries: OrderedDict, key):
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return value
+    
+    def _put(self, entries: OrderedDict, key, entry: tuple):
+        entries[key] = entry
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+identity_cache = IdentityCache(settings.IDENTITY_CACHE_TTL, settings.IDENTITY_CACHE_MAX_ENTRIES)
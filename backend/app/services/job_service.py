@@ -0,0 +1,348 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, and_, text
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from typing import Optional, List
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from uuid import UUID
+import logging
+import os
+import threading
+import time
+
+from app.config import get_settings
+from app.db.database import SessionLocal
+from app.db.replicas import replica_router
+from app.models.job import Job
+from app.schemas.job import (
+    JobCreate, ReportCardJobParams,
+    ClassroomReportCardsJobParams, PaymentReceiptJobParams
+)
+from app.services.report_service import ReportService
+from app.services.finance_report_service import FinanceReportService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock key held while claiming, shared by every API process
+JOB_CLAIM_LOCK = 0x6A6F6273
+
+# ==========================================
+# Job Handlers - kind -> (params schema, allowed roles, handler)
+# Each handler returns (content bytes, media type, download filename)
+# ==========================================
+
+def _run_report_card(db: Session, params: ReportCardJobParams):
+    pdf = ReportService.generate_student_report_card(db, params.student_id, params.term_id)
+    return pdf.getvalue(), "application/pdf", f"report_card_{params.student_id}.pdf"
+
+def _run_classroom_report_cards(db: Session, params: ClassroomReportCardsJobParams):
+    buffer = ReportService.generate_classroom_report_cards(db, params.classroom_id, params.term_id, params.format)
+    media_type = "application/pdf" if params.format == "pdf" else "application/zip"
+    return buffer.getvalue(), media_type, f"report_cards_{params.classroom_id}.{params.format}"
+
+def _run_payment_receipt(db: Session, params: PaymentReceiptJobParams):
+    pdf = FinanceReportService.generate_payment_receipt(db, params.payment_id)
+    return pdf.getvalue(), "application/pdf", f"receipt_{params.payment_id}.pdf"
+
+JOB_HANDLERS = {
+    "report_card": (ReportCardJobParams, ["super_admin", "school_admin", "teacher"], _run_report_card),
+    "classroom_report_cards": (ClassroomReportCardsJobParams, ["super_admin", "school_admin", "teacher"], _run_classroom_report_cards),
+    "payment_receipt": (PaymentReceiptJobParams, ["super_admin", "school_admin", "bursar"], _run_payment_receipt),
+}
+
+class JobService:
+    """
+    Service for submitting, tracking and cancelling background jobs.
+    """
+    
+    @staticmethod
+    def submit_job(db: Session, current_user, data: JobCreate) -> Job:
+        if data.kind not in JOB_HANDLERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown job kind '{data.kind}'. Expected one of: {', '.join(JOB_HANDLERS)}"
+            )
+        
+        params_schema, allowed_roles, _ = JOB_HANDLERS[data.kind]
+        if current_user.role not in allowed_roles:
+            raise HTTPException(status_code=403, detail="Forbidden")
+        
+        try:
+            params = params_schema(**data.params)
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors(include_url=False))
+        
+        db_job = Job(
+            school_id=current_user.school_id,
+            created_by_id=current_user.id,
+            kind=data.kind,
+            params=params.model_dump(mode="json"),
+            status="queued"
+        )
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+        
+        notify_job_workers()
+        return db_job
+    
+    @staticmethod
+    def get_job(db: Session, current_user, job_id: UUID) -> Job:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        # Jobs are only visible inside their own school
+        if not job or (current_user.role != "super_admin" and job.school_id != current_user.school_id):
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+    
+    @staticmethod
+    def cancel_job(db: Session, current_user, job_id: UUID) -> Job:
+        """
+        Cancel a queued or running job.
+        A running job finishes its current work, but its result is discarded.
+        """
+        job = JobService.get_job(db, current_user, job_id)
+        if job.status not in ["queued", "running"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job is already {job.status}"
+            )
+        
+        job.status = "cancelled"
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        db.refresh(job)
+        return job
+    
+    @staticmethod
+    def get_job_result(db: Session, current_user, job_id: UUID) -> Job:
+        job = JobService.get_job(db, current_user, job_id)
+        if job.status != "completed":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job is {job.status}, result not available"
+            )
+        if not job.result_path or not os.path.exists(job.result_path):
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="Job result no longer available")
+        return job
+    
+    # --- Worker side ---
+    
+    @staticmethod
+    def claim_next_job(db: Session, max_per_school: int) -> Optional[UUID]:
+        """
+        Atomically move the oldest eligible queued job to 'running'.
+        Skips schools that already have `max_per_school` jobs running.
+        
+        On Postgres the whole claim runs under a transaction-scoped advisory
+        lock, so the per-school limit holds across API processes. SQLite
+        deployments are single-process, where _claim_lock is enough.
+        """
+        if db.bind.dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": JOB_CLAIM_LOCK})
+        
+        running = dict(
+            db.query(Job.school_id, func.count(Job.id))
+            .filter(Job.status == "running")
+            .group_by(Job.school_id)
+            .all()
+        )
+        busy_schools = [school_id for school_id, count in running.items() if count >= max_per_school and school_id is not None]
+        
+        query = db.query(Job.id).filter(Job.status == "queued")
+        if busy_schools:
+            query = query.filter(or_(Job.school_id.is_(None), Job.school_id.notin_(busy_schools)))
+        
+        for (job_id,) in query.order_by(Job.created_at).limit(20).all():
+            # Conditional update - the job may have been cancelled meanwhile
+            now = datetime.utcnow()
+            claimed = db.query(Job).filter(Job.id == job_id, Job.status == "queued").update(
+                {"status": "running", "started_at": now, "heartbeat_at": now, "attempts": Job.attempts + 1},
+                synchronize_session=False
+            )
+            if claimed:
+                db.commit()
+                return job_id
+        db.commit()
+        return None
+    
+    @staticmethod
+    def recover_stale_jobs(db: Session) -> int:
+        """
+        Requeue running jobs whose worker stopped sending heartbeats (a crash
+        or restart), so they don't hold their school's slot forever. Jobs that
+        were abandoned JOB_MAX_ATTEMPTS times are marked failed instead.
+        """
+        now = datetime.utcnow()
+        stale = and_(
+            Job.status == "running",
+            or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < now - timedelta(seconds=settings.JOB_LEASE_TIMEOUT))
+        )
+        failed = db.query(Job).filter(stale, Job.attempts >= settings.JOB_MAX_ATTEMPTS).update(
+            {"status": "failed", "error": "Worker stopped responding", "finished_at": now},
+            synchronize_session=False
+        )
+        requeued = db.query(Job).filter(stale).update(
+            {"status": "queued", "started_at": None, "heartbeat_at": None},
+            synchronize_session=False
+        )
+        db.commit()
+        if failed or requeued:
+            logger.warning("Recovered stale jobs: %d requeued, %d failed", requeued, failed)
+        return requeued
+    
+    @staticmethod
+    def expire_job_results(max_age: int) -> int:
+        """
+        Delete result files older than `max_age` seconds. Their jobs then
+        answer 410 Gone, as for any missing result.
+        """
+        if not os.path.isdir(settings.JOB_RESULTS_DIR):
+            return 0
+        cutoff = time.time() - max_age
+        removed = 0
+        for entry in os.scandir(settings.JOB_RESULTS_DIR):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass  # Removed by another process
+        return removed
+    
+    @staticmethod
+    def execute_job(db: Session, job_id: UUID):
+        job = db.query(Job).filter(Job.id == job_id).first()
+        params_schema, _, handler = JOB_HANDLERS[job.kind]
+        
+        # Report data is read-only, so it can come from a replica
+        read_db = replica_router.session()
+        try:
+            with _heartbeat(job_id):
+                content, media_type, filename = handler(read_db, params_schema(**job.params))
+        except Exception as e:
+            db.rollback()
+            logger.exception("Job %s (%s) failed", job_id, job.kind)
+            db.query(Job).filter(Job.id == job_id, Job.status == "running").update(
+                {"status": "failed", "error": str(getattr(e, "detail", e)), "finished_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+            return
+        finally:
+            read_db.close()
+        
+        os.makedirs(settings.JOB_RESULTS_DIR, exist_ok=True)
+        result_path = os.path.join(settings.JOB_RESULTS_DIR, f"{job_id}{os.path.splitext(filename)[1]}")
+        with open(result_path, "wb") as f:
+            f.write(content)
+        
+        # Only complete if nobody cancelled the job while it ran
+        completed = db.query(Job).filter(Job.id == job_id, Job.status == "running").update(
+            {
+                "status": "completed",
+                "result_path": result_path,
+                "result_filename": filename,
+                "result_media_type": media_type,
+                "finished_at": datetime.utcnow(),
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        if not completed:
+            os.remove(result_path)
+
+# ==========================================
+# Worker Pool - threads in the API process that drain the queue
+# ==========================================
+
+_workers: List[threading.Thread] = []
+_wakeup = threading.Event()
+_stopping = threading.Event()
+# Serialises claims inside this process so the per-school limit holds exactly
+_claim_lock = threading.Lock()
+_maintenance_lock = threading.Lock()
+_last_maintenance = 0.0
+
+@contextmanager
+def _heartbeat(job_id: UUID):
+    """
+    Keep a running job's lease alive from a side thread while it works.
+    """
+    done = threading.Event()
+    
+    def beat():
+        while not done.wait(settings.JOB_HEARTBEAT_INTERVAL):
+            db = SessionLocal()
+            try:
+                db.query(Job).filter(Job.id == job_id, Job.status == "running").update(
+                    {"heartbeat_at": datetime.utcnow()}, synchronize_session=False
+                )
+                db.commit()
+            except Exception:
+                logger.exception("Heartbeat for job %s failed", job_id)
+            finally:
+                db.close()
+    
+    thread = threading.Thread(target=beat, name=f"job-heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+def _run_maintenance(db: Session):
+    """
+    Recover stale jobs and expire old results, at most once per heartbeat interval per process.
+    """
+    global _last_maintenance
+    if not _maintenance_lock.acquire(blocking=False):
+        return
+    try:
+        if time.monotonic() - _last_maintenance < settings.JOB_HEARTBEAT_INTERVAL:
+            return
+        _last_maintenance = time.monotonic()
+        JobService.recover_stale_jobs(db)
+        JobService.expire_job_results(settings.JOB_RESULT_TTL)
+    finally:
+        _maintenance_lock.release()
+
+def _worker_loop():
+    while not _stopping.is_set():
+        db = SessionLocal()
+        try:
+            _run_maintenance(db)
+            with _claim_lock:
+                job_id = JobService.claim_next_job(db, settings.JOB_MAX_PER_SCHOOL)
+            if job_id:
+                JobService.execute_job(db, job_id)
+                continue
+        except Exception:
+            logger.exception("Job worker error")
+        finally:
+            db.close()
+        
+        _wakeup.wait(settings.JOB_POLL_INTERVAL)
+        _wakeup.clear()
+
+def start_job_workers():
+    _stopping.clear()
+    for i in range(settings.JOB_WORKERS):
+        worker = threading.Thread(target=_worker_loop, name=f"job-worker-{i}", daemon=True)
+        worker.start()
+        _workers.append(worker)
+
+def stop_job_workers():
+    _stopping.set()
+    _wakeup.set()
+    for worker in _workers:
+        worker.join(timeout=5)
+    _workers.clear()
+
+def notify_job_workers():
+    """
+    Wake idle workers in this process instead of waiting for the next poll.
+    """
+    _wakeup.set()
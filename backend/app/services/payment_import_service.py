@@ -0,0 +1,231 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from fastapi import HTTPException, status
+from typing import BinaryIO, Iterator, List, Tuple
+from collections import defaultdict
+from datetime import datetime
+from uuid import UUID
+from dateutil import parser as date_parser
+from openpyxl import load_workbook
+import codecs
+import csv
+import math
+import uuid
+
+from app.db.upsert import chunked
+from app.models.finance import Payment
+from app.models.student import Student
+from app.services.finance_service import FinanceService
+
+# Column names we accept in statement files, mapped to our field names
+COLUMN_ALIASES = {
+    "admission_number": "admission_number",
+    "admission_no": "admission_number",
+    "admission": "admission_number",
+    "amount": "amount_paid",
+    "amount_paid": "amount_paid",
+    "reference": "reference_number",
+    "reference_number": "reference_number",
+    "ref": "reference_number",
+    "transaction_id": "reference_number",
+    "payment_method": "payment_method",
+    "method": "payment_method",
+    "date": "date",
+    "payment_date": "date",
+}
+
+# Rows validated, looked up and inserted together
+IMPORT_CHUNK_SIZE = 1000
+
+class PaymentImportService:
+    """
+    Service for importing bank-statement and mobile-money payment files.
+    
+    Files are read row by row (CSV, or XLSX in openpyxl read-only mode) and
+    processed in fixed-size chunks: one student lookup, one duplicate
+    reference check and one multi-row insert per chunk, so memory stays
+    flat however long the statement is.
+    """
+    
+    @staticmethod
+    def import_payments(
+        db: Session,
+        school_id: UUID,
+        recorder_id: UUID,
+        term_id: UUID,
+        file: BinaryIO,
+        filename: str,
+        default_method: str = "Bank"
+    ) -> dict:
+        rows = PaymentImportService._read_rows(file, filename)
+        
+        total_rows = 0
+        imported = 0
+        errors = []
+        
+        for chunk in chunked(rows, IMPORT_CHUNK_SIZE):
+            total_rows += len(chunk)
+            payments, chunk_errors = PaymentImportService._process_chunk(
+                db, school_id, recorder_id, term_id, chunk, default_method
+            )
+            errors.extend(chunk_errors)
+            if not payments:
+                continue
+            
+            db.execute(insert(Payment), payments)
+            
+            paid_by_student = defaultdict(float)
+            for payment in payments:
+                paid_by_student[payment["student_id"]] += payment["amount_paid"]
+            FinanceService.add_payments_to_ledger(db, school_id, term_id, paid_by_student)
+            
+            # Flush so the next chunk's duplicate check sees these references
+            db.flush()
+            imported += len(payments)
+        
+        # The whole file is one transaction: a crash never leaves half a statement behind
+        db.commit()
+        
+        return {
+            "total_rows": total_rows,
+            "imported": imported,
+            "failed": len(errors),
+            "errors": errors,
+        }
+    
+    @staticmethod
+    def _process_chunk(
+        db: Session,
+        school_id: UUID,
+        recorder_id: UUID,
+        term_id: UUID,
+        chunk: List[Tuple[int, dict]],
+        default_method: str
+    ) -> Tuple[List[dict], List[dict]]:
+        errors = []
+        parsed = []
+        for line, raw in chunk:
+            try:
+                parsed.append((line, PaymentImportService._parse_row(raw, default_method)))
+            except ValueError as e:
+                errors.append({"line": line, "error": str(e)})
+        
+        # 1. Resolve admission numbers in one query
+        admission_numbers = {row["admission_number"] for _, row in parsed}
+        students = dict(db.query(Student.admission_number, Student.id).filter(
+            Student.school_id == school_id,
+            Student.admission_number.in_(admission_numbers)
+        ).all()) if admission_numbers else {}
+        
+        # 2. References already recorded (unique in the payments table)
+        references = {row["reference_number"] for _, row in parsed if row["reference_number"]}
+        existing = set(db.scalars(
+            select(Payment.reference_number).where(Payment.reference_number.in_(references))
+        )) if references else set()
+        
+        now = datetime.utcnow()
+        payments = []
+        for line, row in parsed:
+            student_id = students.get(row["admission_number"])
+            if not student_id:
+                errors.append({"line": line, "error": f"Unknown admission number '{row['admission_number']}'"})
+                continue
+            if row["reference_number"] and row["reference_number"] in existing:
+                errors.append({"line": line, "error": f"Duplicate reference number '{row['reference_number']}'"})
+                continue
+            if row["reference_number"]:
+                existing.add(row["reference_number"])  # Also catch repeats within the file
+            
+            payments.append({
+                "id": uuid.uuid4(),
+                "school_id": school_id,
+                "student_id": student_id,
+                "term_id": term_id,
+                "amount_paid": row["amount_paid"],
+                "date": row["date"] or now,
+                "payment_method": row["payment_method"],
+                "reference_number": row["reference_number"],
+                "recorded_by_id": recorder_id,
+                "created_at": now,
+            })
+        
+        return payments, errors
+    
+    @staticmethod
+    def _parse_row(raw: dict, default_method: str) -> dict:
+        admission_number = str(raw.get("admission_number") or "").strip()
+        if not admission_number:
+            raise ValueError("Missing admission number")
+        
+        try:
+            amount = float(str(raw.get("amount_paid") or "").replace(",", "").strip())
+        except ValueError:
+            raise ValueError(f"Invalid amount '{raw.get('amount_paid')}'")
+        if not math.isfinite(amount):  # float() also accepts "nan", "inf" and "1e309"
+            raise ValueError(f"Invalid amount '{raw.get('amount_paid')}'")
+        if amount <= 0:
+            raise ValueError("Amount must be greater than 0")
+        
+        payment_date = raw.get("date")
+        if payment_date and not isinstance(payment_date, datetime):
+            try:
+                payment_date = date_parser.parse(str(payment_date))
+            except (ValueError, OverflowError):
+                raise ValueError(f"Invalid date '{payment_date}'")
+        
+        reference = str(raw.get("reference_number") or "").strip()
+        method = str(raw.get("payment_method") or default_method).strip()
+        # Checked here so one over-long cell is an error row, not a failed insert of the whole file
+        for label, value, column in [
+            ("Reference number", reference, Payment.reference_number),
+            ("Payment method", method, Payment.payment_method),
+        ]:
+            if len(value) > column.type.length:
+                raise ValueError(f"{label} is longer than {column.type.length} characters")
+        
+        return {
+            "admission_number": admission_number,
+            "amount_paid": amount,
+            "reference_number": reference or None,
+            "payment_method": method,
+            "date": payment_date or None,
+        }
+    
+    @staticmethod
+    def _read_rows(file: BinaryIO, filename: str) -> Iterator[Tuple[int, dict]]:
+        """
+        Yield (line number, row dict) pairs with normalised column names.
+        """
+        if filename.lower().endswith(".xlsx"):
+            rows = PaymentImportService._iter_xlsx(file)
+        else:
+            rows = PaymentImportService._iter_csv(file)
+        
+        header = next(rows, None)
+        if header is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File is empty")
+        
+        columns = [COLUMN_ALIASES.get(str(name or "").strip().lower().replace(" ", "_")) for name in header]
+        if "admission_number" not in columns or "amount_paid" not in columns:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File must have admission_number and amount columns"
+            )
+        
+        for line, values in enumerate(rows, start=2):
+            if not any(value not in (None, "") for value in values):
+                continue  # Skip blank lines
+            yield line, {column: value for column, value in zip(columns, values) if column}
+    
+    @staticmethod
+    def _iter_csv(file: BinaryIO) -> Iterator[list]:
+        # utf-8-sig drops the BOM Excel adds to CSV exports
+        yield from csv.reader(codecs.iterdecode(file, "utf-8-sig", errors="replace"))
+    
+    @staticmethod
+    def _iter_xlsx(file: BinaryIO) -> Iterator[tuple]:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
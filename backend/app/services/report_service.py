@@ -2,16 +2,54 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from PyPDF2 import PdfWriter
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException
 from io import BytesIO
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from uuid import UUID
+import multiprocessing
+import threading
+import time
+import zipfile
 
-from app.models.student import Student
+from app.config import get_settings
+from app.models.student import Student, Enrollment
 from app.models.academic import Term, Classroom
 from app.services.attendance_service import AttendanceService
+from app.services.document_cache import document_cache
 from app.services.grade_service import GradeService
+from app.utils.metrics import PDF_RENDER_DURATION
 from app.models.subject import Subject
 
+settings = get_settings()
+
+# Shared pool of PDF render processes, created on first batch request
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_lock = threading.Lock()
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared ReportLab render pool.
+    Uses 'spawn' so workers never inherit DB connections or threadpool locks.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=settings.REPORT_WORKERS or None,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _render_pool
+
+def shutdown_render_pool():
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(cancel_futures=True)
+            _render_pool = None
+
 class ReportService:
     """
     Service for generating PDF report cards.
@@ -19,24 +57,126 @@ class ReportService:
     
     @staticmethod
     def generate_student_report_card(db: Session, student_id: UUID, term_id: UUID) -> BytesIO:
-        # 1. Fetch data
+        data = ReportService.get_report_card_data(db, student_id, term_id)
+        key = document_cache.make_key("report_card", data)
+        path = document_cache.get_or_render(key, lambda: ReportService.render_report_card(data), "report_card")
+        with open(path, "rb") as f:
+            return BytesIO(f.read())
+    
+    @staticmethod
+    def get_report_card_data(db: Session, student_id: UUID, term_id: UUID) -> dict:
+        """
+        Everything a student's report card shows, as plain data.
+        Also the cache key input, so any grade or attendance change means a new render.
+        """
         student = db.query(Student).filter(Student.id == student_id).first()
         term = db.query(Term).filter(Term.id == term_id).first()
+        if not student or not term:
+            raise HTTPException(status_code=404, detail="Student or term not found")
         # In a real app we'd fetch the user info linked to student
         
+        att_summary = AttendanceService.get_student_attendance_summary(db, student_id, term_id)
+        
+        # Fetch subjects for this class
+        # This is dynamic in a real app, here we simulate by fetching all subjects in school
+        subjects = db.query(Subject).filter(Subject.school_id == student.school_id).all()
+        subject_grades = GradeService.calculate_student_term_grades(
+            db, student_id, term_id, [sub.id for sub in subjects]
+        )
+        
+        return ReportService._report_card_data(term, student, att_summary, subjects, subject_grades)
+    
+    @staticmethod
+    def generate_classroom_report_cards(db: Session, classroom_id: UUID, term_id: UUID, output: str = "zip") -> BytesIO:
+        """
+        Report cards for every active student in a classroom.
+        
+        All data is prefetched in a handful of set-based queries, then the
+        ReportLab rendering is spread across the render process pool.
+        
+        Args:
+            output: "zip" for one PDF per student, "pdf" for a single merged PDF
+        """
+        # 1. Prefetch everything up front
+        term = db.query(Term).filter(Term.id == term_id).first()
+        if not term:
+            raise HTTPException(status_code=404, detail="Term not found")
+        
+        students = db.query(Student).join(Enrollment).filter(
+            Enrollment.classroom_id == classroom_id,
+            Enrollment.term_id == term_id,
+            Enrollment.status == "active"
+        ).order_by(Student.admission_number).all()
+        if not students:
+            raise HTTPException(status_code=404, detail="No active students enrolled in this classroom for the term")
+        
+        student_ids = [student.id for student in students]
+        subjects = db.query(Subject).filter(Subject.school_id == students[0].school_id).all()
+        attendance = AttendanceService.get_attendance_summaries(db, student_ids, term_id)
+        grades = GradeService.calculate_term_grades(db, student_ids, term_id, [sub.id for sub in subjects])
+        
+        payloads = [
+            ReportService._report_card_data(term, student, attendance[student.id], subjects, grades[student.id])
+            for student in students
+        ]
+        
+        # 2. Render in parallel (results come back in roster order)
+        start = time.perf_counter()
+        pool = get_render_pool()
+        chunksize = max(1, len(payloads) // ((settings.REPORT_WORKERS or multiprocessing.cpu_count()) * 4))
+        pdfs = pool.map(ReportService.render_report_card, payloads, chunksize=chunksize)
+        
+        # 3. Package
+        buffer = BytesIO()
+        if output == "pdf":
+            writer = PdfWriter()
+            for pdf in pdfs:
+                writer.append(BytesIO(pdf))
+            writer.write(buffer)
+        else:
+            # PDFs are already compressed, so store rather than deflate
+            with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+                for student, pdf in zip(students, pdfs):
+                    archive.writestr(f"report_card_{student.admission_number}.pdf", pdf)
+        PDF_RENDER_DURATION.labels("classroom_report_cards").observe(time.perf_counter() - start)
+        
+        buffer.seek(0)
+        return buffer
+    
+    @staticmethod
+    def _report_card_data(term: Term, student: Student, att_summary: dict, subjects: List[Subject], subject_grades: dict) -> dict:
+        """
+        Flatten everything a report card shows into plain, picklable data.
+        """
+        return {
+            "term_name": term.name,
+            "admission_number": student.admission_number,
+            "attendance": att_summary,
+            "performance": [
+                [sub.name, f"{subject_grades[sub.id]['final_percentage']}%", subject_grades[sub.id]['status']]
+                for sub in subjects
+            ],
+        }
+    
+    @staticmethod
+    def render_report_card(data: dict) -> bytes:
+        """
+        Render report card data to PDF bytes.
+        Pure function with no DB access, so it can run in a worker process.
+        """
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
         elements = []
         styles = getSampleStyleSheet()
         
         # Header
-        elements.append(Paragraph(f"REPORT CARD - {term.name}", styles['Title']))
+        elements.append(Paragraph(f"REPORT CARD - {data['term_name']}", styles['Title']))
         elements.append(Spacer(1, 12))
-        elements.append(Paragraph(f"Student Admission: {student.admission_number}", styles['Normal']))
+        elements.append(Paragraph(f"Student Admission: {data['admission_number']}", styles['Normal']))
         elements.append(Spacer(1, 24))
         
         # Attendance Summary
-        att_summary = AttendanceService.get_student_attendance_summary(db, student_id, term_id)
+        att_summary = data["attendance"]
         elements.append(Paragraph("Attendance Summary", styles['Heading2']))
         att_data = [
             ["Metric", "Value"],
@@ -59,15 +199,8 @@ class ReportService:
         
         # Academic Performance
         elements.append(Paragraph("Academic Performance", styles['Heading2']))
-        # Fetch subjects for this class
-        # This is dynamic in a real app, here we simulate by fetching all subjects in school
-        subjects = db.query(Subject).filter(Subject.school_id == student.school_id).all()
+        perf_data = [["Subject", "Final %", "Status"]] + data["performance"]
         
-        perf_data = [["Subject", "Final %", "Status"]]
-        for sub in subjects:
-            res = GradeService.calculate_student_subject_grade(db, student_id, sub.id, term_id)
-            perf_data.append([sub.name, f"{res['final_percentage']}%", res['status']])
-            
         t2 = Table(perf_data, colWidths=[200, 100, 100])
         t2.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
@@ -78,5 +211,4 @@ class ReportService:
         elements.append(t2)
         
         doc.build(elements)
-        buffer.seek(0)
-        return buffer
+        return buffer.getvalue()
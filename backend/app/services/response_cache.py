@@ -0,0 +1,195 @@
+from collections import OrderedDict
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlencode
+from uuid import UUID
+import hashlib
+import logging
+import threading
+import time
+
+from app.config import get_settings
+from app.services.document_cache import etag_matches
+from app.utils.metrics import CACHE_LOOKUPS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class CacheUnavailable(Exception):
+    """
+    The backend couldn't be reached. Callers serve the request uncached.
+    """
+
+# ==========================================
+# Backends - store serialized responses and per-namespace version counters
+# ==========================================
+
+class MemoryCacheBackend:
+    """
+    In-process LRU with TTL. Invalidation only reaches this worker process;
+    other workers serve their copy until the TTL runs out.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires_at)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def get_version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+    
+    def bump_version(self, namespace: str):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+class RedisCacheBackend:
+    """
+    Shared Redis store, so an invalidation in one worker reaches all of them.
+    Redis errors are raised as CacheUnavailable.
+    """
+    
+    def __init__(self, url: str, timeout: float):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self._errors = redis.RedisError
+    
+    def get(self, key: str) -> Optional[bytes]:
+        return self._call(self.client.get, f"rc:{key}")
+    
+    def set(self, key: str, value: bytes, ttl: int):
+        self._call(self.client.set, f"rc:{key}", value, ex=ttl)
+    
+    def get_version(self, namespace: str) -> int:
+        return int(self._call(self.client.get, f"rc:version:{namespace}") or 0)
+    
+    def bump_version(self, namespace: str):
+        self._call(self.client.incr, f"rc:version:{namespace}")
+    
+    def _call(self, method, *args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        except self._errors as e:
+            raise CacheUnavailable(str(e)) from e
+
+# ==========================================
+# Response Cache
+# ==========================================
+
+class ResponseCache:
+    """
+    Tenant-scoped cache of serialized JSON responses for reference data
+    (subjects, classrooms, years, terms, fee structures).
+    
+    Keys are resource + school_id + a version counter + query parameters.
+    Invalidating a resource for a school just bumps its version, so stale
+    entries are never read again and age out by TTL or LRU.
+    """
+    
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self._adapters: Dict[Any, TypeAdapter] = {}
+    
+    def respond(
+        self,
+        request: Request,
+        resource: str,
+        school_id: Optional[UUID],
+        load: Callable[[], Any],
+        response_type: Any
+    ) -> Response:
+        """
+        Serve `resource` for this school from the cache, calling `load` on a miss.
+        Carries an ETag; answers 304 when the client already has this version.
+        """
+        namespace = self._namespace(resource, school_id)
+        params = urlencode(sorted(request.query_params.multi_items()))
+        
+        try:
+            key = f"{namespace}:v{self.backend.get_version(namespace)}:{params}"
+            cached = self.backend.get(key)
+        except CacheUnavailable as e:
+            logger.warning("Response cache unavailable, serving %s uncached: %s", resource, e)
+            CACHE_LOOKUPS.labels("response", "error").inc()
+            key = cached = None
+        
+        if cached is not None:
+            CACHE_LOOKUPS.labels("response", "hit").inc()
+            etag, body = cached.split(b"\n", 1)
+            etag = etag.decode()
+        else:
+            if key is not None:
+                CACHE_LOOKUPS.labels("response", "miss").inc()
+            body = self._adapter(response_type).dump_json(load())
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            if key is not None:
+                try:
+                    self.backend.set(key, etag.encode() + b"\n" + body, self.ttl)
+                except CacheUnavailable as e:
+                    logger.warning("Response cache unavailable, %s not stored: %s", resource, e)
+        
+        headers = {
+            "ETag": f'"{etag}"',
+            # Always revalidate, so changes show up on the next page load
+            "Cache-Control": "private, no-cache",
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    def invalidate(self, resource: str, school_id: Optional[UUID]):
+        """
+        Call after committing a change to `resource` for this school.
+        If the backend is down the change is already committed, so this only
+        logs; entries cached before the outage expire within the TTL.
+        
+        Super admins (no school) read every school's data through the global
+        namespace, so that is bumped too.
+        """
+        try:
+            self.backend.bump_version(self._namespace(resource, school_id))
+            if school_id is not None:
+                self.backend.bump_version(self._namespace(resource, None))
+        except CacheUnavailable as e:
+            logger.error("Response cache unavailable, %s for school %s not invalidated: %s", resource, school_id, e)
+    
+    def _namespace(self, resource: str, school_id: Optional[UUID]) -> str:
+        return f"{resource}:{school_id or 'global'}"
+    
+    def _adapter(self, response_type: Any) -> TypeAdapter:
+        adapter = self._adapters.get(response_type)
+        if adapter is None:
+            adapter = self._adapters[response_type] = TypeAdapter(response_type)
+        return adapter
+
+def _make_backend():
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_REDIS_TIMEOUT)
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+response_cache = ResponseCache(_make_backend(), settings.RESPONSE_CACHE_TTL)
@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 
+from app.db.pagination import KeysetPage, Page
 from app.models.school import School
 from app.schemas.school import SchoolCreate, SchoolUpdate
 
@@ -47,11 +48,11 @@ class SchoolService:
         return db.query(School).filter(School.id == school_id).first()
 
     @staticmethod
-    def get_all_schools(db: Session, skip: int = 0, limit: int = 100) -> List[School]:
+    def get_all_schools(db: Session, page: KeysetPage) -> Page:
         """
-        Retrieve all schools (useful for Super Admin).
+        Retrieve all schools (useful for Super Admin), one page at a time.
         """
-        return db.query(School).offset(skip).limit(limit).all()
+        return page.fetch(db, page.select())
 
     @staticmethod
     def update_school(db: Session, school_id: UUID, school_data: SchoolUpdate) -> Optional[School]:
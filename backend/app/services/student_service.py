@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 
+from app.db.pagination import KeysetPage, Page
 from app.models.student import Student, Enrollment
 from app.models.user import User
 from app.schemas.student import StudentCreate, StudentUpdate, EnrollmentCreate
+from app.services.finance_service import FinanceService
 
 class StudentService:
     """
@@ -37,17 +41,22 @@ class StudentService:
         return db_student
 
     @staticmethod
-    def get_students(db: Session, school_id: UUID, classroom_id: Optional[UUID] = None) -> List[Student]:
-        query = db.query(Student).filter(Student.school_id == school_id)
+    async def get_students(db: AsyncSession, school_id: UUID, page: KeysetPage, classroom_id: Optional[UUID] = None) -> Page:
+        query = page.select().where(Student.school_id == school_id)
         if classroom_id:
-            query = query.join(Enrollment).filter(Enrollment.classroom_id == classroom_id, Enrollment.status == "active")
-        return query.all()
+            query = query.join(Enrollment).where(Enrollment.classroom_id == classroom_id, Enrollment.status == "active")
+        return await page.fetch_async(db, query)
 
     @staticmethod
     def enroll_student(db: Session, data: EnrollmentCreate) -> Enrollment:
         # Simple enrollment logic - in a real system we'd check if term/classroom belong to same school
         db_enrollment = Enrollment(**data.model_dump())
         db.add(db_enrollment)
+        db.flush()
+        
+        # Pick up the classroom's fees in the student's balance ledger
+        school_id = select(Student.school_id).where(Student.id == data.student_id).scalar_subquery()
+        FinanceService.update_ledger(db, school_id, data.student_id, data.term_id, refresh_fees=True)
         db.commit()
         db.refresh(db_enrollment)
         return db_enrollment
@@ -6,6 +6,7 @@ from uuid import UUID
 from app.models.subject import Subject, TeacherAssignment
 from app.models.user import User
 from app.schemas.subject import SubjectCreate, SubjectUpdate, TeacherAssignmentCreate
+from app.services.response_cache import response_cache
 
 class SubjectService:
     """
@@ -18,6 +19,7 @@ class SubjectService:
         db.add(db_subject)
         db.commit()
         db.refresh(db_subject)
+        response_cache.invalidate("subjects", school_id)
         return db_subject
 
     @staticmethod
@@ -0,0 +1,140 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Optional: without it, clients get gzip
+    brotli = None
+
+# Only text-like bodies shrink; PDFs, images and xlsx files are already compressed
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "text/",
+)
+
+class _GzipCompressor:
+    encoding = "gzip"
+    
+    def __init__(self, level: int):
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        return self._zlib.flush(zlib.Z_FINISH)
+
+class _BrotliCompressor:
+    encoding = "br"
+    
+    def __init__(self, quality: int):
+        self._brotli = brotli.Compressor(quality=quality)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data)
+    
+    def flush(self) -> bytes:
+        return self._brotli.flush()
+    
+    def finish(self) -> bytes:
+        return self._brotli.finish()
+
+class CompressionMiddleware:
+    """
+    Brotli or gzip response compression, like Starlette's GZipMiddleware but:
+    - prefers brotli when the client accepts it and the package is installed,
+    - skips bodies under `minimum_size` and content types that don't compress,
+    - flushes every chunk of a streamed response, so clients see rows as they are sent.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        accepted = {
+            coding.split(";")[0].strip().lower()
+            for coding in Headers(scope=scope).get("accept-encoding", "").split(",")
+        }
+        if brotli is not None and "br" in accepted:
+            make_compressor = lambda: _BrotliCompressor(self.brotli_quality)
+        elif "gzip" in accepted:
+            make_compressor = lambda: _GzipCompressor(self.gzip_level)
+        else:
+            await self.app(scope, receive, send)
+            return
+        
+        await _CompressionResponder(self.app, self.minimum_size, make_compressor)(scope, receive, send)
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, minimum_size: int, make_compressor):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.make_compressor = make_compressor
+        self.compressor = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+    
+    async def send_compressed(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows whether to compress
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            return
+        
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            
+            self.compressor = self.make_compressor()
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.compressor.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.initial_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(self.initial_message)
+        elif self.passthrough:
+            await self.send(message)
+            return
+        
+        # Streamed response: compress and flush each chunk as it arrives
+        chunk = self.compressor.compress(body)
+        chunk += self.compressor.flush() if more_body else self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,75 @@
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram,
+    CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+import os
+
+# Prometheus metrics served at /metrics.
+#
+# With several uvicorn/gunicorn workers, set PROMETHEUS_MULTIPROC_DIR to an
+# empty directory (wipe it before each server start). Every worker writes its
+# samples there and /metrics aggregates all of them, whichever worker answers.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# ==========================================
+# HTTP
+# ==========================================
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests served",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being served",
+    multiprocess_mode="livesum"
+)
+
+# ==========================================
+# Database pools
+# ==========================================
+
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "db_pool_checkout_duration_seconds", "Time to get a connection from the pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Pool checkouts that timed out", ["pool"])
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool",
+    ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OPEN = Gauge(
+    "db_pool_connections_open", "Connections open (in use or idle)",
+    ["pool"], multiprocess_mode="livesum"
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed while serving requests", ["route"])
+
+# ==========================================
+# Caches and documents
+# ==========================================
+
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups", ["cache", "result"])
+PDF_RENDER_DURATION = Histogram(
+    "pdf_render_duration_seconds", "Time to render PDF documents",
+    ["kind"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+def render_metrics() -> tuple:
+    """
+    Current metrics in Prometheus text format, as (body, content type).
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+def mark_process_dead():
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,44 @@
+from fastapi import HTTPException, Request, status
+from fastapi.routing import APIRoute
+from typing import Any, Callable
+import msgpack
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+
+class MsgPackRequest(Request):
+    """
+    A request whose body is MessagePack. FastAPI reads it through json(),
+    so it goes through the same (single) body validation as a JSON body.
+    """
+    
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            try:
+                self._json = msgpack.unpackb(await self.body(), timestamp=0)
+            except (ValueError, msgpack.UnpackException):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid msgpack body")
+        return self._json
+
+class MsgPackRoute(APIRoute):
+    """
+    Route class that accepts "Content-Type: application/msgpack" request
+    bodies as well as JSON. MessagePack is smaller on the wire and faster to
+    parse, which matters for large bulk submissions from mobile clients.
+    UUIDs and dates are sent as strings, exactly as in JSON.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        
+        async def route_handler(request: Request):
+            content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type in MSGPACK_TYPES:
+                # Present the body as JSON-shaped so FastAPI hands it to json()
+                headers = [
+                    (name, b"application/json" if name == b"content-type" else value)
+                    for name, value in request.scope["headers"]
+                ]
+                request = MsgPackRequest({**request.scope, "headers": headers}, request.receive)
+            return await handler(request)
+        
+        return route_handler
@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import gzip
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+import orjson
+
+from app.schemas.finance import PaymentResponse
+from app.schemas.student import StudentResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def make_students(n: int) -> list:
+    school_id = uuid.uuid4()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), school_id=school_id,
+            admission_number=f"STU{i:06d}", date_of_birth=date(2012, 1, 1) + timedelta(days=i % 2000),
+            gender="Female" if i % 2 else "Male", guardian_name=f"Guardian {i}", guardian_phone="+263771234567"
+        )
+        for i in range(n)
+    ]
+
+def make_payments(n: int) -> list:
+    school_id, term_id = uuid.uuid4(), uuid.uuid4()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), school_id=school_id, student_id=uuid.uuid4(), term_id=term_id,
+            amount_paid=150.0 + i % 300, payment_method="Bank Transfer", reference_number=f"REF{i:08d}",
+            date=datetime(2024, 1, 1) + timedelta(minutes=i), recorded_by_id=uuid.uuid4()
+        )
+        for i in range(n)
+    ]
+
+def timed(fn, repeat: int) -> float:
+    """
+    Best of `repeat` runs, in milliseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def bench(name: str, schema, rows: list, repeat: int):
+    field = create_response_field(name="bench", type_=List[schema])
+    loop = asyncio.new_event_loop()
+    
+    def validate():
+        # What FastAPI does with a response_model before rendering
+        return loop.run_until_complete(serialize_response(field=field, response_content=rows, is_coroutine=True))
+    
+    content = validate()
+    columns = list(schema.model_fields)
+    as_dicts = [{column: getattr(row, column) for column in columns} for row in rows]
+    body = ORJSONResponse(content).body
+    
+    per_1k = 1000 / len(rows)
+    results = [
+        ("response_model + JSONResponse (before)", timed(lambda: JSONResponse(validate()), repeat)),
+        ("response_model + ORJSONResponse (after)", timed(lambda: ORJSONResponse(validate()), repeat)),
+        ("  render only: json.dumps", timed(lambda: JSONResponse(content), repeat)),
+        ("  render only: orjson", timed(lambda: ORJSONResponse(content), repeat)),
+        ("column rows + orjson, no response_model (paginated lists)", timed(lambda: orjson.dumps(as_dicts), repeat)),
+    ]
+    loop.close()
+    
+    print(f"\n{name}: {len(rows)} rows, {len(body) / 1024:.0f} KiB of JSON")
+    for label, ms in results:
+        print(f"   {label:<60} {ms * per_1k:8.2f} ms / 1k rows")
+    
+    print("   Compression:")
+    for label, compress in [
+        ("gzip level 6", lambda: gzip.compress(body, compresslevel=6)),
+        ("brotli quality 4", lambda: brotli.compress(body, quality=4) if brotli else None),
+    ]:
+        if compress() is None:
+            print(f"   {label:<60} (brotli not installed)")
+            continue
+        ms = timed(compress, repeat)
+        print(f"   {label:<60} {ms * per_1k:8.2f} ms / 1k rows, {len(compress()) / len(body):.0%} of original size")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serialization cost per 1k rows, before and after ORJSONResponse.")
+    parser.add_argument("--rows", type=int, default=5000, help="Rows per list")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+    
+    bench("GET /students/", StudentResponse, make_students(args.rows), args.repeat)
+    bench("GET /finance/payments/all", PaymentResponse, make_payments(args.rows), args.repeat)
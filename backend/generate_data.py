@@ -0,0 +1,367 @@
+import argparse
+import csv
+import io
+import itertools
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from passlib.hash import bcrypt
+from sqlalchemy import create_engine
+
+from app.config import get_settings
+from app.db.database import Base
+from app.db.upsert import chunked
+from app.models.school import School
+from app.models.user import User
+from app.models.academic import AcademicYear, Term, Classroom
+from app.models.student import Student, Enrollment
+from app.models.subject import Subject, TeacherAssignment
+from app.models.performance import Attendance, Assessment, Grade
+from app.models.finance import FeeStructure, Payment, StudentTermBalance
+from app.models.job import Job
+
+settings = get_settings()
+
+FIRST_NAMES = [
+    "Tendai", "Rudo", "Tatenda", "Chipo", "Farai", "Nyasha", "Tafadzwa", "Kudzai", "Tinashe", "Rumbidzai",
+    "Tapiwa", "Fadzai", "Takudzwa", "Vimbai", "Simbarashe", "Ruvimbo", "Blessing", "Precious", "Brian", "Grace",
+    "John", "Mary", "David", "Sarah", "Michael", "Ruth", "Daniel", "Esther", "Joseph", "Faith",
+]
+LAST_NAMES = [
+    "Moyo", "Ncube", "Sibanda", "Dube", "Ndlovu", "Mpofu", "Nyathi", "Chikwanha", "Mutasa", "Chiweshe",
+    "Mlambo", "Makoni", "Gumbo", "Marufu", "Zhou", "Banda", "Phiri", "Mhlanga", "Shumba", "Chirwa",
+]
+SUBJECTS = [
+    ("Mathematics", "MATH"), ("English Language", "ENG"), ("Combined Science", "SCI"), ("History", "HIST"),
+    ("Geography", "GEO"), ("Shona", "SHO"), ("Computer Science", "CS"), ("Principles of Accounting", "ACC"),
+]
+GRADE_LEVELS = ["Form 1", "Form 2", "Form 3", "Form 4", "Form 5", "Form 6"]
+# (title, type, total marks, weight)
+ASSESSMENTS = [
+    ("Quiz 1", "quiz", 20.0, 20.0),
+    ("Assignment", "assignment", 50.0, 30.0),
+    ("End of Term Exam", "exam", 100.0, 50.0),
+]
+PAYMENT_METHODS = ["Cash", "Bank Transfer", "Mobile Money"]
+CLASS_SIZE = 35
+
+def term_calendar(year: int):
+    return [
+        ("First Term", date(year, 1, 13), date(year, 4, 4)),
+        ("Second Term", date(year, 5, 5), date(year, 8, 1)),
+        ("Third Term", date(year, 9, 8), date(year, 11, 28)),
+    ]
+
+def school_days(start: date, end: date):
+    days = (end - start).days + 1
+    return [start + timedelta(days=i) for i in range(days) if (start + timedelta(days=i)).weekday() < 5]
+
+class BulkWriter:
+    """
+    Appends rows to tables in batches over one raw DBAPI connection:
+    COPY ... FROM STDIN on Postgres, executemany on SQLite.
+    Rows are tuples in the order of `columns`.
+    """
+    
+    def __init__(self, engine, batch_size: int):
+        self.dialect = engine.dialect
+        if self.dialect.name not in ("postgresql", "sqlite"):
+            raise NotImplementedError(f"Bulk loading is not supported on '{self.dialect.name}'")
+        self.batch_size = batch_size
+        self.connection = engine.raw_connection()
+        self.counts = Counter()
+        self._processors = {}
+        
+        if self.dialect.name == "sqlite":
+            # A generated dataset can always be regenerated, so skip fsyncs
+            cursor = self.connection.cursor()
+            cursor.execute("PRAGMA synchronous = OFF")
+            cursor.execute("PRAGMA journal_mode = MEMORY")
+            cursor.close()
+    
+    def write(self, model, columns: list, rows):
+        table = model.__table__
+        for chunk in chunked(rows, self.batch_size):
+            if self.dialect.name == "postgresql":
+                self._copy(table, columns, chunk)
+            else:
+                self._executemany(table, columns, chunk)
+            self.counts[table.name] += len(chunk)
+    
+    def commit(self):
+        self.connection.commit()
+    
+    def close(self):
+        self.connection.close()
+    
+    def _copy(self, table, columns: list, chunk: list):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in chunk:
+            writer.writerow(["\\N" if value is None else value for value in row])
+        buffer.seek(0)
+        
+        cursor = self.connection.cursor()
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer
+        )
+        cursor.close()
+    
+    def _executemany(self, table, columns: list, chunk: list):
+        # Same value conversions SQLAlchemy would apply (UUID -> hex, dates -> ISO strings)
+        key = (table.name, tuple(columns))
+        processors = self._processors.get(key)
+        if processors is None:
+            processors = self._processors[key] = [
+                table.c[name].type.bind_processor(self.dialect) for name in columns
+            ]
+        rows = [
+            tuple(process(value) if process else value for process, value in zip(processors, row))
+            for row in chunk
+        ]
+        
+        cursor = self.connection.cursor()
+        cursor.executemany(
+            f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            rows
+        )
+        cursor.close()
+
+class Generator:
+    """
+    Builds one school at a time, writing parents before children so
+    foreign keys hold on Postgres. Every value comes from one seeded RNG
+    (including ids and timestamps), so the same arguments give the same dataset.
+    """
+    
+    def __init__(self, writer: BulkWriter, args):
+        self.writer = writer
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.clock = itertools.count()
+        self.epoch = datetime(args.year, 1, 1, 6, 0, 0)
+        self.terms = term_calendar(args.year)
+        self.payment_number = itertools.count(1)
+        
+        # One deterministic hash shared by every generated user
+        salt = "".join(self.rng.choice("./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789") for _ in range(21))
+        salt += self.rng.choice(".Oeu")
+        self.password_hash = bcrypt.using(salt=salt, rounds=settings.BCRYPT_ROUNDS).hash(args.password)
+    
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+    
+    def timestamp(self) -> datetime:
+        # Strictly increasing, so keyset pagination order is stable
+        return self.epoch + timedelta(milliseconds=next(self.clock))
+    
+    def generate(self, index: int):
+        rng = self.rng
+        code = f"GEN{self.args.seed}-{index:05d}"
+        domain = f"{code.lower()}.example.com"
+        
+        # School, staff and calendar
+        school_id = self.uuid()
+        self.writer.write(School, ["id", "name", "code", "address", "phone", "email", "subscription_status", "created_at", "updated_at"], [
+            (school_id, f"{rng.choice(LAST_NAMES)} High School {index + 1}", code, f"{rng.randint(1, 999)} Samora Machel Ave, Harare",
+             f"+26377{rng.randint(1000000, 9999999)}", f"info@{domain}", "active", self.timestamp(), self.timestamp())
+        ])
+        
+        user_columns = ["id", "school_id", "email", "password_hash", "first_name", "last_name", "phone", "role", "is_active", "created_at", "updated_at"]
+        def user(email: str, role: str, first_name: str = None, last_name: str = None):
+            user_id = self.uuid()
+            now = self.timestamp()
+            return user_id, (user_id, school_id, email, self.password_hash, first_name or rng.choice(FIRST_NAMES),
+                             last_name or rng.choice(LAST_NAMES), None, role, True, now, now)
+        
+        admin_id, admin = user(f"admin@{domain}", "school_admin", "School", "Admin")
+        bursar_id, bursar = user(f"bursar@{domain}", "bursar")
+        teachers = [user(f"teacher{i + 1}@{domain}", "teacher") for i in range(len(SUBJECTS))]
+        self.writer.write(User, user_columns, [admin, bursar] + [row for _, row in teachers])
+        
+        year_id = self.uuid()
+        self.writer.write(AcademicYear, ["id", "school_id", "name", "start_date", "end_date", "is_current"], [
+            (year_id, school_id, str(self.args.year), self.terms[0][1], self.terms[-1][2], True)
+        ])
+        term_ids = [self.uuid() for _ in self.terms]
+        self.writer.write(Term, ["id", "academic_year_id", "name", "start_date", "end_date", "status"], [
+            (term_id, year_id, name, start, end, "completed" if i < len(self.terms) - 1 else "active")
+            for i, (term_id, (name, start, end)) in enumerate(zip(term_ids, self.terms))
+        ])
+        
+        subject_ids = [self.uuid() for _ in SUBJECTS]
+        self.writer.write(Subject, ["id", "school_id", "name", "code"], [
+            (subject_id, school_id, name, subject_code) for subject_id, (name, subject_code) in zip(subject_ids, SUBJECTS)
+        ])
+        
+        # Classrooms and fee structures
+        classroom_count = max(1, -(-self.args.students // CLASS_SIZE))
+        classrooms = []
+        for i in range(classroom_count):
+            level = GRADE_LEVELS[i % len(GRADE_LEVELS)]
+            section = chr(ord("A") + i // len(GRADE_LEVELS))
+            classrooms.append((self.uuid(), level, section))
+        self.writer.write(Classroom, ["id", "school_id", "name", "grade_level", "section", "room_number"], [
+            (classroom_id, school_id, f"{level}{section}", level, section, f"R{i + 1:03d}")
+            for i, (classroom_id, level, section) in enumerate(classrooms)
+        ])
+        self.writer.write(TeacherAssignment, ["id", "teacher_id", "classroom_id", "subject_id", "term_id", "role"], [
+            (self.uuid(), teacher_id, classroom_id, subject_id, term_id, "main_teacher")
+            for classroom_id, _, _ in classrooms
+            for (teacher_id, _), subject_id in zip(teachers, subject_ids)
+            for term_id in term_ids
+        ])
+        
+        fees = {}
+        fee_rows = []
+        for classroom_id, level, _ in classrooms:
+            amount = 1200.0 + 100.0 * GRADE_LEVELS.index(level)
+            for term_id in term_ids:
+                fees[(classroom_id, term_id)] = amount
+                now = self.timestamp()
+                fee_rows.append((self.uuid(), school_id, classroom_id, term_id, amount, "Tuition and levies", now, now))
+        self.writer.write(FeeStructure, ["id", "school_id", "classroom_id", "term_id", "total_amount", "description", "created_at", "updated_at"], fee_rows)
+        
+        # Students: (student_id, classroom_id, ability) - ability drives their marks
+        students = []
+        student_users = []
+        student_rows = []
+        for i in range(self.args.students):
+            user_id, row = user(f"student{i + 1:06d}@{domain}", "student")
+            student_users.append(row)
+            student_id = self.uuid()
+            classroom_id = classrooms[i % classroom_count][0]
+            students.append((student_id, classroom_id, min(max(rng.gauss(0.62, 0.15), 0.05), 1.0)))
+            student_rows.append((
+                student_id, user_id, school_id, f"{code}-{i + 1:06d}",
+                date(self.args.year - 13 - GRADE_LEVELS.index(classrooms[i % classroom_count][1]), rng.randint(1, 12), rng.randint(1, 28)),
+                rng.choice(["Male", "Female"]), f"{rng.choice(FIRST_NAMES)} {row[5]}", f"+26371{rng.randint(1000000, 9999999)}",
+                self.timestamp()
+            ))
+        self.writer.write(User, user_columns, student_users)
+        self.writer.write(Student, ["id", "user_id", "school_id", "admission_number", "date_of_birth", "gender", "guardian_name", "guardian_phone", "created_at"], student_rows)
+        
+        self.writer.write(Enrollment, ["id", "student_id", "classroom_id", "term_id", "enrolled_at", "status"], (
+            (self.uuid(), student_id, classroom_id, term_id, datetime.combine(start, datetime.min.time()), "active")
+            for student_id, classroom_id, _ in students
+            for term_id, (_, start, _) in zip(term_ids, self.terms)
+        ))
+        
+        # Daily attendance for every school day of every term
+        self.writer.write(Attendance, ["id", "school_id", "student_id", "classroom_id", "term_id", "date", "status", "remarks", "created_at", "updated_at"], (
+            self._attendance_row(school_id, student_id, classroom_id, term_id, day)
+            for term_id, (_, start, end) in zip(term_ids, self.terms)
+            for day in school_days(start, end)[:self.args.attendance_days or None]
+            for student_id, classroom_id, _ in students
+        ))
+        
+        # Assessments per classroom, subject and term, and everyone's grades
+        assessments = []
+        for classroom_id, _, _ in classrooms:
+            for subject_id in subject_ids:
+                for term_id, (_, start, end) in zip(term_ids, self.terms):
+                    for title, kind, total_marks, weight in ASSESSMENTS[:self.args.assessments]:
+                        held_on = start + timedelta(days=rng.randint(0, (end - start).days))
+                        assessments.append((self.uuid(), school_id, classroom_id, subject_id, term_id, title, kind, total_marks, weight, held_on))
+        self.writer.write(Assessment, ["id", "school_id", "classroom_id", "subject_id", "term_id", "title", "type", "total_marks", "weight", "date"], assessments)
+        
+        by_classroom = {}
+        for student_id, classroom_id, ability in students:
+            by_classroom.setdefault(classroom_id, []).append((student_id, ability))
+        self.writer.write(Grade, ["id", "student_id", "assessment_id", "marks_obtained", "remarks", "created_at", "updated_at"], (
+            self._grade_row(student_id, ability, assessment[0], assessment[7])
+            for assessment in assessments
+            for student_id, ability in by_classroom[assessment[2]]
+        ))
+        
+        # Payments in installments, and the balance ledger they add up to
+        balances = []
+        payments = []
+        for student_id, classroom_id, _ in students:
+            for term_id, (_, start, end) in zip(term_ids, self.terms):
+                total_fees = fees[(classroom_id, term_id)]
+                paid = self._payments(payments, school_id, student_id, term_id, start, end, total_fees, bursar_id, code)
+                balances.append((self.uuid(), school_id, student_id, term_id, total_fees, paid, self.timestamp()))
+        self.writer.write(Payment, ["id", "school_id", "student_id", "term_id", "amount_paid", "date", "payment_method", "reference_number", "recorded_by_id", "created_at"], payments)
+        self.writer.write(StudentTermBalance, ["id", "school_id", "student_id", "term_id", "total_fees", "total_paid", "updated_at"], balances)
+        
+        self.writer.commit()
+    
+    def _attendance_row(self, school_id, student_id, classroom_id, term_id, day: date) -> tuple:
+        roll = self.rng.random()
+        status = "present" if roll < 0.9 else "absent" if roll < 0.95 else "late" if roll < 0.99 else "excused"
+        now = self.timestamp()
+        return (self.uuid(), school_id, student_id, classroom_id, term_id, day, status, None, now, now)
+    
+    def _grade_row(self, student_id, ability: float, assessment_id, total_marks: float) -> tuple:
+        score = min(max(self.rng.gauss(ability, 0.1), 0.0), 1.0)
+        now = self.timestamp()
+        return (self.uuid(), student_id, assessment_id, round(score * total_marks, 1), None, now, now)
+    
+    def _payments(self, payments: list, school_id, student_id, term_id, start: date, end: date,
+                  total_fees: float, recorded_by_id, code: str) -> float:
+        """
+        Add 0-3 installments for one student and term; most pay in full, some owe.
+        """
+        rng = self.rng
+        roll = rng.random()
+        target = total_fees if roll < 0.7 else round(total_fees * rng.uniform(0.2, 0.9), 2) if roll < 0.95 else 0.0
+        installments = rng.randint(1, 3) if target else 0
+        
+        paid = 0.0
+        for i in range(installments):
+            amount = round(target - paid, 2) if i == installments - 1 else round(target / installments, 2)
+            paid_at = datetime.combine(start + timedelta(days=rng.randint(0, (end - start).days)), datetime.min.time())
+            payments.append((
+                self.uuid(), school_id, student_id, term_id, amount, paid_at + timedelta(hours=rng.randint(8, 16)),
+                rng.choice(PAYMENT_METHODS), f"{code}-P{next(self.payment_number):08d}", recorded_by_id, self.timestamp()
+            ))
+            paid += amount
+        return round(paid, 2)
+
+def generate(args):
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    writer = BulkWriter(engine, args.batch_size)
+    generator = Generator(writer, args)
+    
+    print(f"🏭 Generating {args.schools} schools x {args.students} students (seed {args.seed}) into {engine.url.render_as_string(hide_password=True)}")
+    started = time.perf_counter()
+    try:
+        for index in range(args.schools):
+            generator.generate(index)
+            rows = sum(writer.counts.values())
+            print(f"   School {index + 1}/{args.schools}: {rows:,} rows so far, {time.perf_counter() - started:.1f}s")
+    except Exception as e:
+        print(f"❌ Error during generation: {e}")
+        writer.connection.rollback()
+        raise
+    finally:
+        writer.close()
+        engine.dispose()
+    
+    elapsed = time.perf_counter() - started
+    total = sum(writer.counts.values())
+    for table, count in sorted(writer.counts.items(), key=lambda item: -item[1]):
+        print(f"   {table:<24} {count:>12,}")
+    print(f"✅ {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s). Every user's password is '{args.password}'")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic dataset for load tests and benchmarks.")
+    parser.add_argument("--schools", type=int, default=1, help="Number of schools")
+    parser.add_argument("--students", type=int, default=500, help="Students per school")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed; the same seed gives the same dataset")
+    parser.add_argument("--year", type=int, default=2025, help="Academic year (three terms)")
+    parser.add_argument("--attendance-days", type=int, default=0, help="School days of attendance per term (0 = the whole term)")
+    parser.add_argument("--assessments", type=int, default=len(ASSESSMENTS), choices=range(0, len(ASSESSMENTS) + 1),
+                        help="Assessments per subject per term")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per COPY / executemany batch")
+    parser.add_argument("--password", default="Password123!", help="Password for every generated user")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="Target database (default: DATABASE_URL)")
+    args = parser.parse_args()
+    
+    generate(args)
@@ -1,3 +1,5 @@
+from sqlalchemy import inspect, text, UniqueConstraint
+
 from app.db.database import engine, Base
 from app.models.school import School
 from app.models.user import User
@@ -5,8 +7,77 @@ from app.models.academic import AcademicYear, Term, Classroom
 from app.models.student import Student, Enrollment
 from app.models.subject import Subject, TeacherAssignment
 from app.models.performance import Attendance, Assessment, Grade
-from app.models.finance import FeeStructure, Payment
+from app.models.finance import FeeStructure, Payment, StudentTermBalance
+from app.models.job import Job
+
+# Tables paginated by (created_at, id); their created_at must never be NULL
+KEYSET_TABLES = [School.__table__, User.__table__, Student.__table__, Payment.__table__]
+
+def upgrade_keyset_columns(connection):
+    """
+    create_all() doesn't alter existing tables, so bring older databases up
+    to date: add students.created_at, backfill NULL created_at values, make
+    the column NOT NULL (Postgres; SQLite can't alter a column in place)
+    and create the keyset indexes.
+    """
+    postgres = connection.dialect.name == "postgresql"
+
+    student_columns = {column["name"] for column in inspect(connection).get_columns("students")}
+    if "created_at" not in student_columns:
+        connection.execute(text("ALTER TABLE students ADD COLUMN created_at TIMESTAMP"))
+
+    # A student existed at least as long as their user account
+    connection.execute(text(
+        "UPDATE students SET created_at = "
+        "(SELECT users.created_at FROM users WHERE users.id = students.user_id) "
+        "WHERE created_at IS NULL"
+    ))
+
+    for table in KEYSET_TABLES:
+        connection.execute(text(f"UPDATE {table.name} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+        if postgres:
+            connection.execute(text(
+                f"ALTER TABLE {table.name} ALTER COLUMN created_at SET DEFAULT now(), "
+                f"ALTER COLUMN created_at SET NOT NULL"
+            ))
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+# Unique keys that bulk upserts use as their ON CONFLICT target
+UPSERT_KEYS = [
+    (Attendance.__table__, "uq_attendance_student_date"),
+    (Grade.__table__, "uq_grade_student_assessment"),
+]
+
+def upgrade_upsert_keys(connection):
+    """
+    Older databases have no unique key behind the bulk upserts, so
+    ON CONFLICT fails. Drop duplicate rows (keeping the most recently
+    updated one) and create the key as a unique index.
+    """
+    inspector = inspect(connection)
+    for table, name in UPSERT_KEYS:
+        constraint = next(c for c in table.constraints if isinstance(c, UniqueConstraint) and c.name == name)
+        columns = [column.name for column in constraint.columns]
+
+        existing = [key["column_names"] for key in inspector.get_unique_constraints(table.name)]
+        existing += [index["column_names"] for index in inspector.get_indexes(table.name) if index["unique"]]
+        if any(set(key) == set(columns) for key in existing):
+            continue
+
+        same_key = " AND ".join(f"newer.{column} = {table.name}.{column}" for column in columns)
+        newer_stamp = "COALESCE(newer.updated_at, newer.created_at, '1970-01-01')"
+        stamp = f"COALESCE({table.name}.updated_at, {table.name}.created_at, '1970-01-01')"
+        connection.execute(text(
+            f"DELETE FROM {table.name} WHERE EXISTS ("
+            f"SELECT 1 FROM {table.name} newer WHERE {same_key} AND ("
+            f"{newer_stamp} > {stamp} OR ({newer_stamp} = {stamp} AND newer.id > {table.name}.id)))"
+        ))
+        connection.execute(text(f"CREATE UNIQUE INDEX {name} ON {table.name} ({', '.join(columns)})"))
 
 print("Initializing local SQLite database...")
 Base.metadata.create_all(bind=engine)
+with engine.begin() as connection:
+    upgrade_keyset_columns(connection)
+    upgrade_upsert_keys(connection)
 print("✅ Database tables created successfully!")
@@ -0,0 +1,44 @@
+import argparse
+
+from app.db.database import SessionLocal
+from app.models.school import School
+from app.models.user import User
+from app.models.academic import AcademicYear, Term, Classroom
+from app.models.student import Student, Enrollment
+from app.models.subject import Subject, TeacherAssignment
+from app.models.performance import Attendance, Assessment, Grade
+from app.models.finance import FeeStructure, Payment, StudentTermBalance
+from app.services.finance_service import FinanceService
+
+def reconcile(apply: bool):
+    db = SessionLocal()
+    
+    try:
+        print("🔎 Reconciling fee ledger against payment history...")
+        drift = FinanceService.reconcile_fee_ledger(db, apply=apply)
+        
+        for entry in drift:
+            print(
+                f"   Student {entry['student_id']} Term {entry['term_id']}: "
+                f"fees {entry['ledger_fees']} -> {entry['expected_fees']}, "
+                f"paid {entry['ledger_paid']} -> {entry['expected_paid']}"
+            )
+        
+        if not drift:
+            print("✅ Ledger matches history, no drift found")
+        elif apply:
+            print(f"✅ Rebuilt {len(drift)} ledger rows")
+        else:
+            print(f"⚠️  {len(drift)} ledger rows drifted (dry run, nothing written)")
+            
+    except Exception as e:
+        print(f"❌ Error during reconciliation: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild student_term_balances from enrollments, fee structures and payments.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift, don't fix it")
+    args = parser.parse_args()
+    reconcile(apply=not args.dry_run)
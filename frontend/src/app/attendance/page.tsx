@@ -2,7 +2,7 @@
 
 import { useState, useEffect, useCallback } from "react";
 import { Check, X, Search, Calendar, Users, Loader2, AlertCircle } from "lucide-react";
-import { apiFetch } from "@/lib/api";
+import { apiFetch, apiFetchAll } from "@/lib/api";
 
 export default function AttendancePage() {
     const [date, setDate] = useState(new Date().toISOString().split('T')[0]);
@@ -33,7 +33,7 @@ export default function AttendancePage() {
         try {
             setLoading(true);
             setError(null);
-            const data = await apiFetch(`/students/?classroom_id=${selectedClassroomId}`);
+            const data = await apiFetchAll(`/students/?classroom_id=${selectedClassroomId}`);
             // Initialize attendance status as present for all
             setStudents(data.map((s: any) => ({ ...s, status: "present" })));
         } catch (err: any) {
@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import { Plus, Search, MoreVertical, Loader2 } from "lucide-react";
-import { apiFetch } from "@/lib/api";
+import { apiFetchAll } from "@/lib/api";
 
 export default function StudentsPage() {
     const [students, setStudents] = useState<any[]>([]);
@@ -13,7 +13,7 @@ export default function StudentsPage() {
         const fetchStudents = async () => {
             try {
                 setLoading(true);
-                const data = await apiFetch("/students/");
+                const data = await apiFetchAll("/students/");
                 setStudents(data);
                 setError(null);
             } catch (err: any) {
@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import { Plus, Search, MoreVertical, BookOpen, Loader2 } from "lucide-react";
-import { apiFetch } from "@/lib/api";
+import { apiFetchAll } from "@/lib/api";
 
 export default function TeachersPage() {
     const [teachers, setTeachers] = useState<any[]>([]);
@@ -14,7 +14,7 @@ export default function TeachersPage() {
             try {
                 setLoading(true);
                 // Fetch users with the "teacher" role
-                const data = await apiFetch("/users/?role=teacher");
+                const data = await apiFetchAll("/users/?role=teacher");
                 setTeachers(data);
                 setError(null);
             } catch (err: any) {
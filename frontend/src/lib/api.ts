@@ -2,7 +2,7 @@
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000/api/v1";
 
-export async function apiFetch(endpoint: string, options: RequestInit = {}) {
+async function request(endpoint: string, options: RequestInit = {}) {
     const token = typeof window !== "undefined" ? localStorage.getItem("auth_token") : null;
 
     const defaultHeaders: HeadersInit = {
@@ -34,5 +34,26 @@ export async function apiFetch(endpoint: string, options: RequestInit = {}) {
         throw new Error(data.detail || "Something went wrong");
     }
 
+    return { data, response };
+}
+
+export async function apiFetch(endpoint: string, options: RequestInit = {}) {
+    const { data } = await request(endpoint, options);
     return data;
 }
+
+// Paginated list endpoints return one page at a time; follow X-Next-Cursor to load them all
+export async function apiFetchAll(endpoint: string, options: RequestInit = {}) {
+    const items: any[] = [];
+    let cursor: string | null = null;
+
+    do {
+        const separator = endpoint.includes("?") ? "&" : "?";
+        const url: string = cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint;
+        const { data, response } = await request(url, options);
+        items.push(...data);
+        cursor = response.headers.get("X-Next-Cursor");
+    } while (cursor);
+
+    return items;
+}